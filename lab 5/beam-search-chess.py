@@ -1,30 +1,141 @@
 import chess
 import chess.engine
+import chess.polyglot
 import heapq
-from typing import List, Tuple, Dict
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, Optional, Tuple, Dict
+
+PIECE_VALUES = {
+    chess.PAWN: 1.0,
+    chess.KNIGHT: 3.0,
+    chess.BISHOP: 3.0,
+    chess.ROOK: 5.0,
+    chess.QUEEN: 9.0,
+    chess.KING: 0.0  # King has special evaluation
+}
+
+CENTER_BONUS = 0.5
+MOBILITY_WEIGHT = 0.1
 
 class ChessBeamSearch:
-    def __init__(self, beam_width: int, search_depth: int):
+    def __init__(self, beam_width: int, search_depth: int, cache_size: int = 100000):
         self.beam_width = beam_width
         self.search_depth = search_depth
         
-    def evaluate_position(self, board: chess.Board) -> float:
-        piece_values = {
-            chess.PAWN: 1.0,
-            chess.KNIGHT: 3.0,
-            chess.BISHOP: 3.0,
-            chess.ROOK: 5.0,
-            chess.QUEEN: 9.0,
-            chess.KING: 0.0  # King has special evaluation
+        # Evaluation cache: Zobrist hash -> score, least recently used first
+        self.cache_size = cache_size
+        self.eval_cache: "OrderedDict[int, float]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+    def evaluate_position(self, board: chess.Board, static_score: Optional[float] = None) -> float:
+        """Score a position, reusing the cached score if it was seen before.
+        
+        `static_score` is the material and centre term from White's point of
+        view, when the caller has already tracked it incrementally.
+        """
+        if self.cache_size <= 0:
+            return self._evaluate_uncached(board, static_score)
+        
+        key = chess.polyglot.zobrist_hash(board)
+        score = self.eval_cache.get(key)
+        if score is not None:
+            self.eval_cache.move_to_end(key)
+            self.cache_hits += 1
+            return score
+        
+        self.cache_misses += 1
+        score = self._evaluate_uncached(board, static_score)
+        self.eval_cache[key] = score
+        if len(self.eval_cache) > self.cache_size:
+            self.eval_cache.popitem(last=False)
+        return score
+    
+    def cache_info(self) -> Dict[str, float]:
+        """Hit/miss counters for the evaluation cache."""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'size': len(self.eval_cache),
+            'hit_rate': self.cache_hits / lookups if lookups else 0.0,
         }
+    
+    @staticmethod
+    def static_score(board: chess.Board) -> float:
+        """Material and centre occupation from White's point of view, from bitboard popcounts."""
+        score = 0.0
+        for piece_type, value in PIECE_VALUES.items():
+            if value:
+                score += value * (chess.popcount(board.pieces_mask(piece_type, chess.WHITE))
+                                  - chess.popcount(board.pieces_mask(piece_type, chess.BLACK)))
+        
+        score += CENTER_BONUS * (chess.popcount(board.occupied_co[chess.WHITE] & chess.BB_CENTER)
+                                 - chess.popcount(board.occupied_co[chess.BLACK] & chess.BB_CENTER))
+        return score
+    
+    @staticmethod
+    def static_delta(board: chess.Board, move: chess.Move) -> float:
+        """Change in `static_score` caused by `move`, computed before it is pushed."""
+        sign = 1.0 if board.turn == chess.WHITE else -1.0
+        delta = 0.0
+        
+        if board.is_en_passant(move):
+            captured_square = move.to_square + (-8 if board.turn == chess.WHITE else 8)
+            captured_type = chess.PAWN
+        else:
+            captured_square = move.to_square
+            captured_type = board.piece_type_at(move.to_square)
+        
+        if captured_type is not None:
+            delta += PIECE_VALUES[captured_type]
+            if chess.BB_SQUARES[captured_square] & chess.BB_CENTER:
+                delta += CENTER_BONUS
         
+        if move.promotion:
+            delta += PIECE_VALUES[move.promotion] - PIECE_VALUES[chess.PAWN]
+        
+        if chess.BB_SQUARES[move.from_square] & chess.BB_CENTER:
+            delta -= CENTER_BONUS
+        if chess.BB_SQUARES[move.to_square] & chess.BB_CENTER:
+            delta += CENTER_BONUS
+        
+        return sign * delta
+    
+    @staticmethod
+    def pseudo_mobility(board: chess.Board) -> int:
+        """Squares attacked by the side to move that are not occupied by its own pieces.
+        
+        A cheap stand-in for counting legal moves: no move objects are created
+        and pins and checks are ignored.
+        """
+        own = board.occupied_co[board.turn]
+        mobility = 0
+        for square in chess.scan_forward(own):
+            mobility += chess.popcount(board.attacks_mask(square) & ~own)
+        return mobility
+    
+    def _evaluate_uncached(self, board: chess.Board, static_score: Optional[float] = None) -> float:
+        if static_score is None:
+            static_score = self.static_score(board)
+        
+        mobility = MOBILITY_WEIGHT * self.pseudo_mobility(board)
+        return static_score + mobility if board.turn == chess.WHITE else -static_score + mobility
+    
+    @staticmethod
+    def reference_evaluation(board: chess.Board) -> float:
+        """The original square-by-square evaluator with legal-move mobility, kept for benchmarking."""
         score = 0.0
         
         # Material balance
         for square in chess.SQUARES:
             piece = board.piece_at(square)
             if piece:
-                value = piece_values[piece.piece_type]
+                value = PIECE_VALUES[piece.piece_type]
                 if piece.color == chess.WHITE:
                     score += value
                 else:
@@ -32,7 +143,7 @@ class ChessBeamSearch:
         
         # Mobility (number of legal moves)
         mobility = len(list(board.legal_moves))
-        score += 0.1 * mobility if board.turn == chess.WHITE else -0.1 * mobility
+        score += MOBILITY_WEIGHT * mobility if board.turn == chess.WHITE else -MOBILITY_WEIGHT * mobility
         
         # Center control
         center_squares = [chess.D4, chess.D5, chess.E4, chess.E5]
@@ -40,56 +151,219 @@ class ChessBeamSearch:
             piece = board.piece_at(square)
             if piece:
                 if piece.color == chess.WHITE:
-                    score += 0.5
+                    score += CENTER_BONUS
                 else:
-                    score -= 0.5
+                    score -= CENTER_BONUS
                     
         return score if board.turn == chess.WHITE else -score
     
-    def get_best_moves(self, board: chess.Board, n: int) -> List[Tuple[float, chess.Move]]:
+    def get_best_moves(self, board: chess.Board, n: int,
+                       static_score: Optional[float] = None) -> List[Tuple[float, chess.Move]]:
+        """Score every legal move with push/pop on the given board (left unchanged)."""
+        if static_score is None:
+            static_score = self.static_score(board)
+        
         moves = []
-        for move in board.legal_moves:
-            board_copy = board.copy()
-            board_copy.push(move)
-            score = self.evaluate_position(board_copy)
+        for move in list(board.legal_moves):
+            child_static = static_score + self.static_delta(board, move)
+            board.push(move)
+            score = self.evaluate_position(board, child_static)
+            board.pop()
             moves.append((-score, move))  # Negative because heapq is min-heap
         
-        return heapq.nsmallest(n, moves)
+        return heapq.nsmallest(n, moves, key=lambda x: x[0])
+    
+    def _replay(self, board: chess.Board, pushed: List[chess.Move], static_scores: List[float],
+                target: Tuple[chess.Move, ...]) -> None:
+        """Bring the shared board from the line `pushed` to the line `target`.
+        
+        Only the moves past the common prefix are popped and pushed, so beam
+        entries that share an opening cost little to rebuild. `static_scores`
+        holds the running static score for the root and each pushed move.
+        """
+        common = 0
+        while common < len(pushed) and common < len(target) and pushed[common] == target[common]:
+            common += 1
+        while len(pushed) > common:
+            board.pop()
+            pushed.pop()
+            static_scores.pop()
+        for move in target[common:]:
+            static_scores.append(static_scores[-1] + self.static_delta(board, move))
+            board.push(move)
+            pushed.append(move)
+    
+    def expand_beam(self, board: chess.Board,
+                    beam: List[Tuple[float, Tuple[chess.Move, ...]]]) -> List[Tuple[float, Tuple[chess.Move, ...]]]:
+        """Expand every beam entry by its best `beam_width` moves from the root `board` (left unchanged)."""
+        # One working board for the whole level; beam entries only keep the
+        # moves from the root and are replayed onto it when expanded
+        shared_board = board.copy()
+        pushed: List[chess.Move] = []
+        static_scores = [self.static_score(shared_board)]
+        new_beam = []
+        
+        for cum_score, move_seq in beam:
+            self._replay(shared_board, pushed, static_scores, move_seq)
+            best_moves = self.get_best_moves(shared_board, self.beam_width, static_scores[-1])
+            
+            for neg_score, move in best_moves:
+                score = -neg_score  # Convert back to actual score
+                new_beam.append((cum_score + score, move_seq + (move,)))
+        
+        return new_beam
     
-    def beam_search(self, board: chess.Board) -> Tuple[List[chess.Move], float]:
+    def beam_search(self, board: chess.Board, pool: Optional["BeamWorkerPool"] = None) -> Tuple[List[chess.Move], float]:
+        """Beam search from `board`, optionally expanding each level across a worker pool."""
         if self.search_depth == 0:
             return [], self.evaluate_position(board)
         
-        beam = [(0, board.copy(), [])]  # (cumulative_score, board_state, move_sequence)
+        beam = [(0, ())]  # (cumulative_score, move_sequence)
         
         for depth in range(self.search_depth):
-            new_beam = []
+            if pool is None:
+                new_beam = self.expand_beam(board, beam)
+            else:
+                new_beam = pool.expand_beam(board, beam, self.beam_width)
             
-            for cum_score, current_board, move_seq in beam:
-                best_moves = self.get_best_moves(current_board, self.beam_width)
-                
-                for neg_score, move in best_moves:
-                    score = -neg_score  # Convert back to actual score
-                    new_board = current_board.copy()
-                    new_board.push(move)
-                    new_move_seq = move_seq + [move]
-                    new_cum_score = cum_score + score
-                    new_beam.append((new_cum_score, new_board, new_move_seq))
+            if not new_beam:
+                break  # Every line in the beam has ended in mate or stalemate
             
             # Keep only the top beam_width candidates
             beam = heapq.nlargest(self.beam_width, new_beam, key=lambda x: x[0])
         
         # Return the best move sequence and its score
-        best_score, _, best_move_seq = max(beam, key=lambda x: x[0])
-        return best_move_seq, best_score
+        best_score, best_move_seq = max(beam, key=lambda x: x[0])
+        return list(best_move_seq), best_score
+
+# Searcher owned by each pool worker; its evaluation cache persists between requests
+_worker_searcher: Optional[ChessBeamSearch] = None
+
+def _init_worker(cache_size: int) -> None:
+    global _worker_searcher
+    _worker_searcher = ChessBeamSearch(beam_width=1, search_depth=1, cache_size=cache_size)
+    # Touch the move generator and evaluator once so the first real request is not slower
+    _worker_searcher.get_best_moves(chess.Board(), 1)
 
-def predict_best_move(fen: str, beam_width: int, depth: int) -> Tuple[List[str], float]:
+def _worker_ready(_: int) -> bool:
+    return _worker_searcher is not None
+
+def _expand_chunk(root_fen: str, beam_width: int,
+                  chunk: List[Tuple[float, Tuple[str, ...]]]) -> List[Tuple[float, Tuple[str, ...]]]:
+    """Expand a slice of the beam inside a worker; moves travel as UCI strings."""
+    _worker_searcher.beam_width = beam_width
+    beam = [(cum_score, tuple(chess.Move.from_uci(uci) for uci in ucis)) for cum_score, ucis in chunk]
+    children = _worker_searcher.expand_beam(chess.Board(root_fen), beam)
+    return [(cum_score, tuple(move.uci() for move in moves)) for cum_score, moves in children]
+
+def _search_fen(fen: str, beam_width: int, depth: int) -> Tuple[List[str], float]:
+    """Full beam search of one position inside a worker, reusing its searcher and cache."""
+    _worker_searcher.beam_width = beam_width
+    _worker_searcher.search_depth = depth
+    moves, score = _worker_searcher.beam_search(chess.Board(fen))
+    return [move.uci() for move in moves], score
+
+class BeamWorkerPool:
+    """
+    Persistent process pool for expanding beam levels in parallel.
+    
+    Workers are started and warmed up once, when the pool is created, so
+    python-chess is imported and initialised per process rather than per
+    request. Use it as a context manager or call close() when done.
+    """
+    def __init__(self, workers: Optional[int] = None, cache_size: int = 100000):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                            initargs=(cache_size,))
+        self.warm_up()
+    
+    def warm_up(self) -> None:
+        """Block until every worker process has started and run its initialiser."""
+        list(self.executor.map(_worker_ready, range(self.workers)))
+    
+    def expand_beam(self, board: chess.Board, beam: List[Tuple[float, Tuple[chess.Move, ...]]],
+                    beam_width: int) -> List[Tuple[float, Tuple[chess.Move, ...]]]:
+        """Split the beam into one contiguous chunk per worker and gather the children in order."""
+        root_fen = board.fen()
+        encoded = [(cum_score, tuple(move.uci() for move in moves)) for cum_score, moves in beam]
+        chunk_size = -(-len(encoded) // self.workers)
+        chunks = [encoded[i:i + chunk_size] for i in range(0, len(encoded), chunk_size)]
+        
+        new_beam = []
+        for children in self.executor.map(_expand_chunk, [root_fen] * len(chunks), [beam_width] * len(chunks), chunks):
+            for cum_score, ucis in children:
+                new_beam.append((cum_score, tuple(chess.Move.from_uci(uci) for uci in ucis)))
+        return new_beam
+    
+    def submit_search(self, fen: str, beam_width: int, depth: int) -> Future:
+        """
+        Queue a complete beam search of one position on the pool.
+        
+        Returns:
+            A future resolving to (moves as UCI strings, score); it raises
+            ValueError for a FEN that does not parse
+        """
+        return self.executor.submit(_search_fen, fen, beam_width, depth)
+    
+    def close(self) -> None:
+        self.executor.shutdown()
+    
+    def __enter__(self) -> "BeamWorkerPool":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def predict_best_move(fen: str, beam_width: int, depth: int,
+                      pool: Optional[BeamWorkerPool] = None) -> Tuple[List[str], float]:
     board = chess.Board(fen)
     searcher = ChessBeamSearch(beam_width, depth)
-    moves, score = searcher.beam_search(board)
+    moves, score = searcher.beam_search(board, pool)
     return [move.uci() for move in moves], score
 
+def benchmark_evaluators(fens: List[str], repeat: int = 20) -> Dict[str, float]:
+    """
+    Compare nodes per second of the original evaluator and the bitboard one.
+    
+    Each node is one child position scored with push/pop, as in get_best_moves.
+    Caching is disabled so both evaluators do the full work every time.
+    
+    Returns:
+        Nodes per second keyed by evaluator name
+    """
+    searcher = ChessBeamSearch(beam_width=1, search_depth=1, cache_size=0)
+    boards = [chess.Board(fen) for fen in fens]
+    
+    def reference(board):
+        for move in list(board.legal_moves):
+            board.push(move)
+            searcher.reference_evaluation(board)
+            board.pop()
+    
+    def bitboard(board):
+        searcher.get_best_moves(board, len(fens))
+    
+    results = {}
+    nodes = repeat * sum(board.legal_moves.count() for board in boards)
+    for name, run in [('reference', reference), ('bitboard', bitboard)]:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for board in boards:
+                run(board)
+        results[name] = nodes / (time.perf_counter() - start)
+        print(f"{name:<10} {results[name]:>12.0f} nodes/s")
+    return results
+
 if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark_evaluators([
+            chess.STARTING_FEN,
+            "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3",
+            "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+            "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        ])
+        sys.exit()
+    
     # Example usage
     current_fen = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"  # Starting position
     beam_width = 3
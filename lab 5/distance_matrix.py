@@ -0,0 +1,121 @@
+import hashlib
+import os
+import tempfile
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Opt-in location for cached matrices; pass it as `cache_dir` to load_distance_matrix
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ai-lab", "distance-matrices")
+DEFAULT_MAX_CACHE_BYTES = 1 << 30
+
+def build_distance_matrix(points: List[Tuple[float, float]], dtype=np.float64,
+                          chunk_rows: int = 1024) -> np.ndarray:
+    """
+    Build the full Euclidean distance matrix with NumPy broadcasting.
+
+    Rows are computed `chunk_rows` at a time, so the float64 temporaries hold
+    chunk_rows x n values and peak memory is set by the output dtype.
+
+    Args:
+        points: List of (x, y) coordinates
+        dtype: Output dtype, e.g. np.float32 to halve the memory of large matrices
+        chunk_rows: Rows computed per chunk
+
+    Returns:
+        An n x n array where matrix[i, j] is the distance from point i to point j
+    """
+    coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    n = len(coords)
+    matrix = np.empty((n, n), dtype=dtype)
+    for start in range(0, n, chunk_rows):
+        stop = min(start + chunk_rows, n)
+        dx = coords[start:stop, 0, np.newaxis] - coords[np.newaxis, :, 0]
+        dy = coords[start:stop, 1, np.newaxis] - coords[np.newaxis, :, 1]
+        dx *= dx
+        dy *= dy
+        dx += dy
+        matrix[start:stop] = np.sqrt(dx, out=dx)
+    return matrix
+
+def coordinate_key(points: List[Tuple[float, float]], dtype=np.float64) -> str:
+    """Hash of the coordinate set and output dtype, used as the cache file name."""
+    coords = np.ascontiguousarray(np.asarray(points, dtype=np.float64).reshape(-1, 2))
+    digest = hashlib.sha256()
+    digest.update(np.dtype(dtype).str.encode())
+    digest.update(str(coords.shape).encode())
+    digest.update(coords.tobytes())
+    return digest.hexdigest()
+
+def prune_cache(cache_dir: str, max_bytes: int, keep: Optional[str] = None) -> None:
+    """
+    Delete the least recently used cached matrices until the cache fits in `max_bytes`.
+
+    Args:
+        cache_dir: Directory holding cached matrices
+        max_bytes: Size limit for all .npy files in the directory
+        keep: Path that is never deleted (the matrix just loaded)
+    """
+    try:
+        entries = [entry for entry in os.scandir(cache_dir) if entry.name.endswith(".npy")]
+    except OSError:
+        return
+    # Loading a matrix refreshes its modification time, so oldest first is least recently used
+    files = sorted((entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in entries)
+    total = sum(size for _, size, _ in files)
+    for _, size, path in files:
+        if total <= max_bytes:
+            break
+        if keep is not None and os.path.abspath(path) == os.path.abspath(keep):
+            continue
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+def load_distance_matrix(points: List[Tuple[float, float]], dtype=np.float64,
+                         cache_dir: Optional[str] = None,
+                         max_cache_bytes: int = DEFAULT_MAX_CACHE_BYTES) -> np.ndarray:
+    """
+    Return the distance matrix for a set of points, optionally through an on-disk cache.
+
+    Without `cache_dir` the matrix is built in memory and nothing is written.
+    With it, matrices are stored as .npy files named by `coordinate_key` and
+    loaded memory-mapped read-only, so repeated runs over the same depot set
+    skip the build and only page in the rows they touch. The directory is
+    kept under `max_cache_bytes` by evicting the least recently used files.
+
+    Args:
+        points: List of (x, y) coordinates
+        dtype: Output dtype (np.float64 or np.float32)
+        cache_dir: Directory holding cached matrices (e.g. DEFAULT_CACHE_DIR), or None
+        max_cache_bytes: Size limit for the cache directory
+
+    Returns:
+        An n x n array of pairwise distances
+    """
+    if cache_dir is None:
+        return build_distance_matrix(points, dtype)
+
+    path = os.path.join(cache_dir, coordinate_key(points, dtype) + ".npy")
+    if os.path.exists(path):
+        try:
+            matrix = np.load(path, mmap_mode="r")
+            os.utime(path)  # Mark as recently used for eviction
+            return matrix
+        except (OSError, ValueError):
+            pass  # Corrupt or truncated file, rebuild it below
+
+    matrix = build_distance_matrix(points, dtype)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file first so concurrent runs never see a partial matrix
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".npy.tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, matrix)
+        os.replace(tmp_path, path)
+        prune_cache(cache_dir, max_cache_bytes, keep=path)
+    except OSError:
+        return matrix  # Cache directory not writable, carry on without it
+    return np.load(path, mmap_mode="r")
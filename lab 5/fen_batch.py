@@ -0,0 +1,125 @@
+"""
+Batch beam-search analysis of FEN positions.
+
+Usage (from this directory):
+    python -m fen_batch positions.fen -o results.jsonl --workers 4
+
+Reads one FEN per line (blank lines and lines starting with '#' are skipped),
+writes one JSON object per position in input order and reports throughput in
+positions per second on stderr.
+"""
+import argparse
+import importlib
+import json
+import sys
+import time
+from collections import deque
+from typing import Dict, IO, Iterable, Iterator, Optional
+
+import chess
+
+# The beam search lives in a script whose file name is not a valid identifier
+beam_search_chess = importlib.import_module("beam-search-chess")
+
+def read_fens(stream: IO[str]) -> Iterator[str]:
+    """Yield FEN strings from a text stream, one per non-empty line."""
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+def _error(index: int, fen: str, error: Exception) -> Dict:
+    # A FEN that does not parse is reported as is; anything else names the exception type
+    message = str(error) if isinstance(error, ValueError) else f"{type(error).__name__}: {error}"
+    return {"index": index, "fen": fen, "error": message}
+
+def _analyse(searcher, index: int, fen: str) -> Dict:
+    try:
+        moves, score = searcher.beam_search(chess.Board(fen))
+    except Exception as e:
+        return _error(index, fen, e)
+    return {"index": index, "fen": fen, "moves": [move.uci() for move in moves], "score": score}
+
+def _collect(index: int, fen: str, future) -> Dict:
+    """Result dict for a pool search; a failing position becomes an error entry, not a failed batch."""
+    try:
+        moves, score = future.result()
+    except Exception as e:
+        return _error(index, fen, e)
+    return {"index": index, "fen": fen, "moves": moves, "score": score}
+
+def analyse_fens(fens: Iterable[str], beam_width: int = 3, depth: int = 3, workers: int = 1,
+                 max_pending: Optional[int] = None, cache_size: int = 100000) -> Iterator[Dict]:
+    """
+    Stream beam-search results for an iterable of FENs, in input order.
+
+    With one worker every position shares a single searcher, so the evaluation
+    cache carries over between positions. With more workers each process keeps
+    its own searcher and cache for the whole batch. At most `max_pending`
+    positions (default 4 per worker) are in flight at once, which bounds memory
+    however long the input is.
+
+    Args:
+        fens: Iterable of FEN strings, consumed lazily
+        beam_width: Beam width for every search
+        depth: Search depth for every search
+        workers: Number of processes analysing positions
+        max_pending: Limit on submitted but not yet yielded positions
+        cache_size: Evaluation cache size per searcher
+
+    Returns:
+        An iterator of result dicts with index, fen, moves and score
+        (or error for positions that fail, such as FENs that do not parse)
+    """
+    if workers <= 1:
+        searcher = beam_search_chess.ChessBeamSearch(beam_width, depth, cache_size)
+        for index, fen in enumerate(fens):
+            yield _analyse(searcher, index, fen)
+        return
+
+    max_pending = max_pending or 4 * workers
+    with beam_search_chess.BeamWorkerPool(workers, cache_size) as pool:
+        pending = deque()
+        for index, fen in enumerate(fens):
+            pending.append((index, fen, pool.submit_search(fen, beam_width, depth)))
+            if len(pending) >= max_pending:
+                yield _collect(*pending.popleft())
+        while pending:
+            yield _collect(*pending.popleft())
+
+def write_jsonl(results: Iterable[Dict], out: IO[str]) -> int:
+    """Write results as JSON lines and return how many were written."""
+    count = 0
+    for result in results:
+        out.write(json.dumps(result) + "\n")
+        count += 1
+    return count
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Beam-search analysis of a file of FEN positions")
+    parser.add_argument("input", help="File with one FEN per line, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="JSONL output file, or - for stdout")
+    parser.add_argument("--beam-width", type=int, default=3)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--max-pending", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input)
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        start = time.perf_counter()
+        results = analyse_fens(read_fens(source), args.beam_width, args.depth, args.workers, args.max_pending)
+        count = write_jsonl(results, out)
+        elapsed = time.perf_counter() - start
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    print(f"Analysed {count} positions in {elapsed:.2f}s ({rate:.1f} positions/s)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
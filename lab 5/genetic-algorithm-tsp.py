@@ -1,38 +1,25 @@
 import random
-import math
-from typing import List, Tuple, Dict
+from typing import List, Optional, Tuple, Dict
+
+import numpy as np
+
+from distance_matrix import load_distance_matrix
 
 class GeneticAlgorithmTSP:
     def __init__(self, cities: List[Tuple[float, float]], population_size: int = 100, 
-                 mutation_rate: float = 0.01, elite_size: int = 20, generations: int = 500):
+                 mutation_rate: float = 0.01, elite_size: int = 20, generations: int = 500,
+                 distance_dtype=np.float64, cache_dir: Optional[str] = None):
         self.cities = cities
         self.population_size = population_size
         self.mutation_rate = mutation_rate
         self.elite_size = elite_size
         self.generations = generations
         self.num_cities = len(cities)
-        self.distance_matrix = self._create_distance_matrix()
-        
-    def _create_distance_matrix(self) -> List[List[float]]:
-        matrix = [[0.0 for _ in range(self.num_cities)] for _ in range(self.num_cities)]
-        
-        for i in range(self.num_cities):
-            for j in range(i+1, self.num_cities):
-                x1, y1 = self.cities[i]
-                x2, y2 = self.cities[j]
-                distance = math.sqrt((x2 - x1)**2 + (y2 - y1)**2)
-                matrix[i][j] = distance
-                matrix[j][i] = distance
-                
-        return matrix
+        self.distance_matrix = load_distance_matrix(cities, distance_dtype, cache_dir)
     
     def _calculate_route_distance(self, route: List[int]) -> float:
-        distance = 0.0
-        for i in range(len(route)):
-            from_city = route[i]
-            to_city = route[(i + 1) % len(route)]
-            distance += self.distance_matrix[from_city][to_city]
-        return distance
+        route = np.asarray(route)
+        return float(self.distance_matrix[route, np.roll(route, -1)].sum(dtype=np.float64))
     
     def _create_initial_population(self) -> List[List[int]]:
         population = []
@@ -1,25 +1,45 @@
+import collections
 import math
+import os
 import random
-from typing import List, Tuple
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from distance_matrix import load_distance_matrix
+
+# A move is (kind, i, j): 'two_opt' reverses route[i:j], 'swap' exchanges route[i] and route[j]
+Move = Tuple[str, int, int]
+
+# Cooling schedules map (initial temperature, step, max steps, rate) to a temperature
+CoolingSchedule = Callable[[float, int, int, float], float]
+
+COOLING_SCHEDULES: Dict[str, CoolingSchedule] = {
+    'geometric': lambda t0, step, max_steps, rate: t0 * rate ** step,
+    'linear': lambda t0, step, max_steps, rate: t0 * max(0.0, 1.0 - step / max_steps),
+    'logarithmic': lambda t0, step, max_steps, rate: t0 / math.log(step + math.e),
+}
 
 class DeliveryRouteOptimizer:
-    def __init__(self, locations: List[Tuple[float, float]]):
+    def __init__(self, locations: List[Tuple[float, float]], distance_dtype=np.float64,
+                 cache_dir: Optional[str] = None):
         self.locations = locations
         self.num_locations = len(locations)
+        self.distance_dtype = distance_dtype
+        self.cache_dir = cache_dir
+        self.distance_matrix = load_distance_matrix(locations, distance_dtype, cache_dir)
+        # Rows converted to lists on first use for the scalar lookups in the move
+        # evaluators, which are several times faster to index from Python than
+        # the array itself; untouched rows of a memory-mapped matrix stay on disk
+        self._distance_rows: List[Optional[List[float]]] = [None] * self.num_locations
+        self._neighbors: Dict[int, List[List[int]]] = {}
         
     def calculate_total_distance(self, route: List[int]) -> float:
-        total_distance = 0.0
-        for i in range(len(route)):
-            from_idx = route[i]
-            to_idx = route[(i + 1) % len(route)]
-            
-            from_x, from_y = self.locations[from_idx]
-            to_x, to_y = self.locations[to_idx]
-            
-            distance = math.sqrt((to_x - from_x) ** 2 + (to_y - from_y) ** 2)
-            total_distance += distance
-            
-        return total_distance
+        route = np.asarray(route)
+        return float(self.distance_matrix[route, np.roll(route, -1)].sum(dtype=np.float64))
     
     def generate_neighbors(self, route: List[int]) -> List[List[int]]:
         neighbors = []
@@ -41,49 +61,501 @@ class DeliveryRouteOptimizer:
                 
         return neighbors
     
-    def hill_climbing(self, max_iterations: int = 1000) -> Tuple[List[int], float]:
-        # Start with a random route
-        current_route = [0] + list(range(1, self.num_locations))
-        random.shuffle(current_route[1:])
+    def _distance(self, from_idx: int, to_idx: int) -> float:
+        row = self._distance_rows[from_idx]
+        if row is None:
+            row = self._distance_rows[from_idx] = self.distance_matrix[from_idx].tolist()
+        return row[to_idx]
+    
+    def two_opt_delta(self, route: List[int], i: int, j: int) -> float:
+        """Change in tour length from reversing route[i:j], in O(1)."""
+        n = len(route)
+        before, first, last, after = route[i - 1], route[i], route[j - 1], route[j % n]
+        return (self._distance(before, last) + self._distance(first, after)
+                - self._distance(before, first) - self._distance(last, after))
+    
+    def swap_delta(self, route: List[int], i: int, j: int) -> float:
+        """Change in tour length from swapping route[i] and route[j] (i < j), in O(1)."""
+        n = len(route)
+        a, b = route[i], route[j]
+        prev_a, next_a = route[i - 1], route[(i + 1) % n]
+        prev_b, next_b = route[j - 1], route[(j + 1) % n]
         
-        current_distance = self.calculate_total_distance(current_route)
+        if j - i == 1:
+            return (self._distance(prev_a, b) + self._distance(a, next_b)
+                    - self._distance(prev_a, a) - self._distance(b, next_b))
+        
+        return (self._distance(prev_a, b) + self._distance(b, next_a)
+                + self._distance(prev_b, a) + self._distance(a, next_b)
+                - self._distance(prev_a, a) - self._distance(a, next_a)
+                - self._distance(prev_b, b) - self._distance(b, next_b))
+    
+    def move_delta(self, route: List[int], move: Move) -> float:
+        kind, i, j = move
+        if kind == 'two_opt':
+            return self.two_opt_delta(route, i, j)
+        return self.swap_delta(route, i, j)
+    
+    def apply_move(self, route: List[int], move: Move) -> None:
+        """Apply a move to the route in place."""
+        kind, i, j = move
+        if kind == 'two_opt':
+            route[i:j] = reversed(route[i:j])
+        else:
+            route[i], route[j] = route[j], route[i]
+    
+    def nearest_neighbors(self, k: int = 8) -> List[List[int]]:
+        """The k nearest other stops of every stop, nearest first, computed once per k."""
+        neighbors = self._neighbors.get(k)
+        if neighbors is None:
+            count = min(k, self.num_locations - 1)
+            neighbors = []
+            # One row at a time, so a memory-mapped matrix is never loaded whole
+            for stop in range(self.num_locations):
+                row = np.array(self.distance_matrix[stop], dtype=np.float64)
+                row[stop] = np.inf
+                nearest = np.argpartition(row, count - 1)[:count] if count > 0 else np.empty(0, dtype=int)
+                neighbors.append(nearest[np.argsort(row[nearest])].tolist())
+            self._neighbors[k] = neighbors
+        return neighbors
+    
+    @staticmethod
+    def pair_move(first: int, second: int) -> Optional[Tuple[int, int]]:
+        """The 2-opt move (i, j) that makes the stops at two route positions adjacent.
+        
+        Reversing route[i:j] with i = min + 1 and j = max + 1 puts the stop at
+        the larger position right after the one at the smaller position.
+        Returns None when they are already adjacent.
+        """
+        if first > second:
+            first, second = second, first
+        if second - first < 2:
+            return None
+        return first + 1, second + 1
+    
+    @staticmethod
+    def reverse_segment(route: List[int], position: List[int], i: int, j: int) -> None:
+        """Reverse route[i:j] in place and update the position of every stop in it."""
+        route[i:j] = reversed(route[i:j])
+        for index in range(i, j):
+            position[route[index]] = index
+    
+    def nearest_neighbor_route(self, neighbor_count: int = 8) -> List[int]:
+        """Greedy tour from the depot that always drives to the nearest unvisited stop.
+        
+        Looks through the `neighbor_count` nearest stops first and scans the
+        whole distance row only when all of them have been visited.
+        """
+        neighbors = self.nearest_neighbors(neighbor_count)
+        visited = [False] * self.num_locations
+        visited[0] = True
+        route = [0]
+        for _ in range(self.num_locations - 1):
+            stop = route[-1]
+            next_stop = next((other for other in neighbors[stop] if not visited[other]), None)
+            if next_stop is None:
+                row = np.array(self.distance_matrix[stop], dtype=np.float64)
+                row[visited] = np.inf
+                next_stop = int(np.argmin(row))
+            visited[next_stop] = True
+            route.append(next_stop)
+        return route
+    
+    def neighbor_descent(self, route: List[int], neighbor_count: int = 8,
+                         deadline: Optional[float] = None) -> List[int]:
+        """First-improvement 2-opt descent over moves between nearby stops, in place.
         
-        for _ in range(max_iterations):
+        Only the moves simulated_annealing and tabu_search propose are tried,
+        so a pass costs O(n * neighbor_count) instead of the O(n^2) of
+        hill_climbing. A stop is looked at again only after a move changes
+        one of its edges, and the descent ends when no stop is left to look
+        at or once time.time() passes `deadline`.
+        """
+        n = len(route)
+        if n < 4:
+            return route
+        neighbors = self.nearest_neighbors(neighbor_count)
+        position = [0] * n
+        for index, stop in enumerate(route):
+            position[stop] = index
+        pending = collections.deque(route)
+        queued = [True] * n
+        checks = 0
+        while pending:
+            checks += 1
+            if deadline is not None and checks % 256 == 0 and time.time() >= deadline:
+                break
+            stop = pending.popleft()
+            queued[stop] = False
+            for neighbor in neighbors[stop]:
+                move = self.pair_move(position[stop], position[neighbor])
+                if move is None or self.two_opt_delta(route, *move) >= -1e-9:
+                    continue
+                i, j = move
+                touched = (route[i - 1], route[i], route[j - 1], route[j % n])
+                self.reverse_segment(route, position, i, j)
+                for other in touched:
+                    if not queued[other]:
+                        queued[other] = True
+                        pending.append(other)
+                break
+        return route
+    
+    def starting_route(self, initial_route: Optional[List[int]], neighbor_count: int,
+                       deadline: Optional[float]) -> List[int]:
+        """A copy of `initial_route`, or the nearest-neighbour tour after neighbor_descent."""
+        if initial_route is not None:
+            return list(initial_route)
+        return self.neighbor_descent(self.nearest_neighbor_route(neighbor_count), neighbor_count, deadline)
+    
+    def random_route(self, rng: random.Random) -> List[int]:
+        stops = list(range(1, self.num_locations))
+        rng.shuffle(stops)
+        return [0] + stops
+    
+    def hill_climbing(self, max_iterations: int = 1000, rng: Optional[random.Random] = None,
+                      deadline: Optional[float] = None) -> Tuple[List[int], float]:
+        """First-improvement hill climbing over the 2-opt and swap neighbourhood.
+        
+        Scans the same moves as generate_neighbors, in the same order, but
+        scores each with the O(1) delta evaluators and applies an improving
+        move in place, then keeps scanning from the next move. It stops at a
+        local optimum (a full pass without improvement), after
+        `max_iterations` improving moves, or once time.time() passes
+        `deadline`, in which case the route reached so far is returned.
+        
+        Returns:
+            The final route and its distance
+        """
+        rng = rng or random.Random()
+        
+        # Start with a random route (the depot stays in front)
+        current_route = self.random_route(rng)
+        n = len(current_route)
+        two_opt_delta, swap_delta = self.two_opt_delta, self.swap_delta
+        
+        iterations = 0
+        improved = True
+        while improved and iterations < max_iterations:
             improved = False
-            neighbors = self.generate_neighbors(current_route)
             
-            for neighbor in neighbors:
-                neighbor_distance = self.calculate_total_distance(neighbor)
-                
-                if neighbor_distance < current_distance:
-                    current_route = neighbor
-                    current_distance = neighbor_distance
-                    improved = True
-                    break
+            for i in range(1, n - 1):
+                if deadline is not None and time.time() >= deadline:
+                    return current_route, self.calculate_total_distance(current_route)
+                for j in range(i + 2, n):
+                    if two_opt_delta(current_route, i, j) < -1e-9:
+                        current_route[i:j] = reversed(current_route[i:j])
+                        iterations += 1
+                        improved = True
+                        if iterations >= max_iterations:
+                            break
+                else:
+                    continue
+                break
             
-            if not improved:
+            if iterations >= max_iterations:
                 break
-                
-        return current_route, current_distance
+            
+            for i in range(1, n - 1):
+                if deadline is not None and time.time() >= deadline:
+                    return current_route, self.calculate_total_distance(current_route)
+                for j in range(i + 1, n):
+                    if swap_delta(current_route, i, j) < -1e-9:
+                        current_route[i], current_route[j] = current_route[j], current_route[i]
+                        iterations += 1
+                        improved = True
+                        if iterations >= max_iterations:
+                            break
+                else:
+                    continue
+                break
+        
+        return current_route, self.calculate_total_distance(current_route)
     
-    def hill_climbing_with_random_restarts(self, num_restarts: int = 5, max_iterations: int = 1000) -> Tuple[List[int], float]:
-        best_route = None
-        best_distance = float('inf')
+    def simulated_annealing(self, max_iterations: int = 100000, time_budget: Optional[float] = None,
+                            initial_temperature: Optional[float] = None,
+                            cooling: Union[str, CoolingSchedule] = 'geometric',
+                            cooling_rate: Optional[float] = None, neighbor_count: int = 8,
+                            initial_route: Optional[List[int]] = None, rng: Optional[random.Random] = None) -> Tuple[List[int], float]:
+        """Simulated annealing over 2-opt moves between nearby stops.
+        
+        Starts from `initial_route`, or by default from starting_route's 2-opt
+        local optimum, so the annealing is spent escaping that optimum rather
+        than untangling a random tour. Each step
+        picks a random stop and one of its `neighbor_count` nearest stops and
+        proposes the 2-opt move that makes them adjacent; two random stops on
+        a long route are almost always far apart, and such moves are rejected.
+        
+        The schedule sees the run as `max_iterations` steps. Under a time
+        budget that runs out first, the step passed to it follows the share of
+        the budget used instead, so the route still cools by the end.
         
-        for _ in range(num_restarts):
-            route, distance = self.hill_climbing(max_iterations)
+        Args:
+            max_iterations: Number of moves proposed after the starting route
+            time_budget: Optional wall-clock limit in seconds, including the
+                descent to the starting route
+            initial_temperature: Starting temperature; estimated from sampled
+                move deltas at the starting route when not given
+            cooling: Name from COOLING_SCHEDULES or a callable
+                (t0, step, max_steps, rate) -> temperature
+            cooling_rate: Rate passed to the cooling schedule; by default the
+                geometric schedule cools by a factor of 10^4 over the run
+            neighbor_count: Nearest stops considered for each stop
+            initial_route: Route to start from instead of starting_route's
+            rng: Random source, for reproducible runs
+        
+        Returns:
+            The best route seen and its distance
+        """
+        rng = rng or random.Random()
+        schedule = COOLING_SCHEDULES[cooling] if isinstance(cooling, str) else cooling
+        deadline = None if time_budget is None else time.time() + time_budget
+        
+        current_route = self.starting_route(initial_route, neighbor_count, deadline)
+        current_distance = self.calculate_total_distance(current_route)
+        best_route, best_distance = current_route.copy(), current_distance
+        
+        n = len(current_route)
+        if n < 4:
+            return best_route, best_distance
+        
+        neighbors = self.nearest_neighbors(neighbor_count)
+        position = [0] * n
+        for index, stop in enumerate(current_route):
+            position[stop] = index
+        two_opt_delta, pair_move = self.two_opt_delta, self.pair_move
+        
+        def propose() -> Optional[Tuple[int, int]]:
+            stop = rng.randrange(n)
+            return pair_move(position[stop], position[rng.choice(neighbors[stop])])
+        
+        if initial_temperature is None:
+            # Hot enough that an average uphill move from the starting route is accepted now and then
+            deltas = (two_opt_delta(current_route, *move) for move in (propose() for _ in range(200)) if move)
+            uphill = [d for d in deltas if d > 0]
+            initial_temperature = 0.4 * (sum(uphill) / len(uphill)) if uphill else 1.0
+        if cooling_rate is None:
+            cooling_rate = 1e-4 ** (1 / max_iterations)
+        
+        start = time.time()
+        temperature = initial_temperature
+        for step in range(max_iterations):
+            if step % 256 == 0:
+                schedule_step = step
+                if deadline is not None:
+                    now = time.time()
+                    if now >= deadline:
+                        break
+                    schedule_step = max(step, int(max_iterations * (now - start) / (deadline - start)))
+                temperature = schedule(initial_temperature, schedule_step, max_iterations, cooling_rate)
             
-            if distance < best_distance:
-                best_route = route
-                best_distance = distance
-                
-        return best_route, best_distance
+            move = propose()
+            if move is None:
+                continue
+            delta = two_opt_delta(current_route, *move)
+            
+            if delta < 0 or (temperature > 0 and rng.random() < math.exp(-delta / temperature)):
+                self.reverse_segment(current_route, position, *move)
+                current_distance += delta
+                if current_distance < best_distance - 1e-9:
+                    best_route, best_distance = current_route.copy(), current_distance
+        
+        return best_route, self.calculate_total_distance(best_route)
+    
+    def tabu_search(self, max_iterations: int = 5000, time_budget: Optional[float] = None,
+                    tenure: Optional[int] = None, neighbor_count: int = 8,
+                    initial_route: Optional[List[int]] = None) -> Tuple[List[int], float]:
+        """Tabu search over 2-opt moves between nearby stops.
+        
+        Starts, like simulated_annealing, from `initial_route` or the 2-opt
+        local optimum of starting_route. Each iteration scores every 2-opt move that makes a stop
+        adjacent to one of its `neighbor_count` nearest stops, with the same
+        delta as two_opt_delta inlined, and takes the best one that is not
+        tabu, even if it makes the route longer. The two edges a move removes
+        may not be added back for `tenure` iterations (a quarter of the number
+        of stops by default), unless the move would beat the best route found
+        so far.
+        
+        Returns:
+            The best route seen and its distance
+        """
+        deadline = None if time_budget is None else time.time() + time_budget
+        
+        current_route = self.starting_route(initial_route, neighbor_count, deadline)
+        current_distance = self.calculate_total_distance(current_route)
+        best_route, best_distance = current_route.copy(), current_distance
+        
+        n = len(current_route)
+        if n < 4:
+            return best_route, best_distance
+        
+        neighbors = self.nearest_neighbors(neighbor_count)
+        position = [0] * n
+        for index, stop in enumerate(current_route):
+            position[stop] = index
+        if tenure is None:
+            tenure = n // 4
+        for stop in range(n):
+            self._distance(stop, stop)  # Fill every row for the inlined lookups below
+        rows = self._distance_rows
+        route = current_route
+        # Iteration until which adding the edge between two stops (smaller stop first) is tabu
+        tabu_until: Dict[Tuple[int, int], int] = {}
+        
+        for iteration in range(max_iterations):
+            if deadline is not None and time.time() >= deadline:
+                break
+            
+            chosen_move, chosen_delta = None, math.inf
+            for stop in range(n):
+                stop_position = position[stop]
+                for neighbor in neighbors[stop]:
+                    # The move reversing route[x + 1:y + 1] joins route[x] to route[y], as pair_move
+                    x, y = stop_position, position[neighbor]
+                    if x > y:
+                        x, y = y, x
+                    if y - x < 2:
+                        continue
+                    before, first, last, after = route[x], route[x + 1], route[y], route[(y + 1) % n]
+                    before_row, last_row = rows[before], rows[last]
+                    delta = before_row[last] + rows[first][after] - before_row[first] - last_row[after]
+                    if delta >= chosen_delta:
+                        continue
+                    
+                    if current_distance + delta >= best_distance - 1e-9 and (
+                            tabu_until.get((before, last) if before < last else (last, before), -1) >= iteration
+                            or tabu_until.get((first, after) if first < after else (after, first), -1) >= iteration):
+                        continue  # Tabu, and not good enough for aspiration
+                    chosen_move, chosen_delta = (x + 1, y + 1), delta
+            
+            if chosen_move is None:
+                break  # Every candidate move is tabu
+            
+            i, j = chosen_move
+            for a, b in ((route[i - 1], route[i]), (route[j - 1], route[j % n])):
+                tabu_until[(a, b) if a < b else (b, a)] = iteration + tenure
+            self.reverse_segment(route, position, i, j)
+            current_distance += chosen_delta
+            
+            if current_distance < best_distance - 1e-9:
+                best_route, best_distance = current_route.copy(), current_distance
+        
+        return best_route, self.calculate_total_distance(best_route)
+    
+    def hill_climbing_with_random_restarts(self, num_restarts: int = 5, max_iterations: int = 1000,
+                                           seed: Optional[int] = None, workers: Optional[int] = None,
+                                           time_budget: Optional[float] = None) -> Tuple[List[int], float]:
+        """Run independent hill-climbing restarts over a process pool.
+        
+        Every restart gets its own seed drawn from a master RNG seeded with `seed`,
+        so a fixed seed gives the same result regardless of how the restarts are
+        scheduled. Ties are broken by restart index for the same reason.
+        
+        If `time_budget` (seconds) runs out, running restarts stop at their next
+        check of the shared deadline and return the route they have reached,
+        restarts that have not started are cancelled, and the best route so far
+        is returned. At least one restart always reports, so a route is
+        returned even with a budget of zero. With `workers=1` the restarts run
+        in this process.
+        """
+        master_rng = random.Random(seed)
+        seeds = [master_rng.getrandbits(64) for _ in range(num_restarts)]
+        # Wall-clock time, so worker processes can check the same deadline
+        deadline = None if time_budget is None else time.time() + time_budget
+        
+        # Best-so-far as (distance, restart index, route)
+        best = (float('inf'), num_restarts, None)
+        
+        if workers is None:
+            workers = min(num_restarts, os.cpu_count() or 1)
+        
+        if workers <= 1:
+            for index, restart_seed in enumerate(seeds):
+                if index > 0 and deadline is not None and time.time() >= deadline:
+                    break
+                route, distance = self.hill_climbing(max_iterations, random.Random(restart_seed), deadline)
+                best = min(best, (distance, index, route))
+            return best[2], best[0]
+        
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            pending = {
+                executor.submit(_run_restart, self.locations, max_iterations, restart_seed,
+                                self.distance_dtype, self.cache_dir, deadline): index
+                for index, restart_seed in enumerate(seeds)
+            }
+            while pending:
+                # Without a result yet, wait for the first restart however long it takes
+                timeout = None
+                if deadline is not None and best[2] is not None:
+                    timeout = max(0.0, deadline - time.time())
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    break  # Time budget exhausted
+                for future in done:
+                    index = pending.pop(future)
+                    route, distance = future.result()
+                    best = min(best, (distance, index, route))
+        finally:
+            # Running restarts see the deadline and return promptly, so this does not block for long
+            executor.shutdown(wait=True, cancel_futures=True)
+        
+        return best[2], best[0]
+
+def _run_restart(locations: List[Tuple[float, float]], max_iterations: int, seed: int,
+                 distance_dtype=np.float64, cache_dir: Optional[str] = None,
+                 deadline: Optional[float] = None) -> Tuple[List[int], float]:
+    """Single restart, run inside a worker process."""
+    optimizer = DeliveryRouteOptimizer(locations, distance_dtype, cache_dir)
+    return optimizer.hill_climbing(max_iterations, random.Random(seed), deadline)
+
+def benchmark_methods(locations: List[Tuple[float, float]], time_budget: float = 20.0,
+                      seed: int = 0) -> List[Tuple[str, float, float]]:
+    """
+    Compare hill climbing, simulated annealing and tabu search on one instance at equal time.
+    
+    Every method runs in this process for the same `time_budget` seconds.
+    Hill climbing is the current method, random restarts keeping the best
+    local optimum; annealing and tabu search descend from a nearest-neighbour
+    tour to one 2-opt local optimum and spend the rest of the budget
+    escaping it. Final distances are compared
+    directly, as a percentage of the hill-climbing distance.
+    
+    Returns:
+        A list of (method, distance, cpu_seconds) tuples
+    """
+    optimizer = DeliveryRouteOptimizer(locations)
+    optimizer.nearest_neighbors()  # Built once up front, outside every method's budget
+    methods = [
+        ('hill_climbing', lambda: optimizer.hill_climbing_with_random_restarts(
+            num_restarts=1000, max_iterations=10 ** 9, seed=seed, workers=1, time_budget=time_budget)),
+        ('simulated_annealing', lambda: optimizer.simulated_annealing(
+            max_iterations=10 ** 9, time_budget=time_budget, rng=random.Random(seed))),
+        ('tabu_search', lambda: optimizer.tabu_search(
+            max_iterations=10 ** 9, time_budget=time_budget)),
+    ]
+    
+    results = []
+    print(f"{'method':<20} {'distance':>12} {'cpu s':>8} {'vs hill climbing':>17}")
+    for name, run in methods:
+        cpu_start = time.process_time()
+        _, distance = run()
+        cpu_seconds = time.process_time() - cpu_start
+        relative = distance / results[0][1] if results else 1.0
+        print(f"{name:<20} {distance:>12.2f} {cpu_seconds:>8.2f} {relative:>16.1%}")
+        results.append((name, distance, cpu_seconds))
+    return results
 
 def optimize_delivery_route(locations: List[Tuple[float, float]]) -> Tuple[List[int], float]:
     optimizer = DeliveryRouteOptimizer(locations)
-    return optimizer.hill_climbing_with_random_restarts()
+    return optimizer.hill_climbing_with_random_restarts(seed=42)
 
 if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        rng = random.Random(42)
+        benchmark_methods([(rng.uniform(0, 1000), rng.uniform(0, 1000)) for _ in range(1000)])
+        sys.exit()
+    
     # Example usage
     locations = [
         (0, 0),      # Starting point (depot)
@@ -1,16 +1,331 @@
-from ortools.sat.python import cp_model
+import sys
+
 import numpy as np
+from scipy import ndimage
+
+# 4-connectivity: land cells touching only at a corner are separate landmasses
+FOUR_CONNECTED = np.array([[0, 1, 0], [1, 1, 1], [0, 1, 0]])
+
+# Moore neighbourhood in clockwise order starting from the west neighbour
+MOORE_OFFSETS = [(0, -1), (-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1)]
+
+def boundary_mask(island_map, above=None, below=None):
+    """
+    Mark land cells with at least one 4-neighbour that is water or off the map.
+    
+    Args:
+        island_map: 2D numpy array where 1 represents land and 0 represents water
+        above: Optional row just above island_map (halo when processing a tile), water if None
+        below: Optional row just below island_map, water if None
+    
+    Returns:
+        A boolean array of the same shape, True on boundary cells
+    """
+    land = np.asarray(island_map) == 1
+    height, width = land.shape
+    
+    # Pad with water (or the halo rows) so every cell has four neighbours to compare against
+    padded = np.zeros((height + 2, width + 2), dtype=bool)
+    padded[1:-1, 1:-1] = land
+    if above is not None:
+        padded[0, 1:-1] = np.asarray(above) == 1
+    if below is not None:
+        padded[-1, 1:-1] = np.asarray(below) == 1
+    
+    interior = padded[:-2, 1:-1] & padded[2:, 1:-1] & padded[1:-1, :-2] & padded[1:-1, 2:]
+    return land & ~interior
+
+def largest_landmass(island_map):
+    """
+    Keep only the largest 4-connected landmass.
+    
+    Args:
+        island_map: 2D numpy array where 1 represents land and 0 represents water
+    
+    Returns:
+        A boolean array, True on the cells of the largest landmass (all False if there is no land)
+    """
+    labels, count = ndimage.label(np.asarray(island_map) == 1, structure=FOUR_CONNECTED)
+    if count == 0:
+        return np.zeros(labels.shape, dtype=bool)
+    sizes = np.bincount(labels.ravel())
+    sizes[0] = 0  # Water
+    return labels == sizes.argmax()
+
+def edge_perimeter(land):
+    """
+    Count the cell edges between land and water or the map border.
+    
+    Args:
+        land: 2D boolean array of land cells
+    
+    Returns:
+        The perimeter in cell edges
+    """
+    land = np.asarray(land, dtype=bool)
+    # Every land cell has four edges; each pair of adjacent land cells hides two of them
+    shared = np.count_nonzero(land[1:, :] & land[:-1, :]) + np.count_nonzero(land[:, 1:] & land[:, :-1])
+    return 4 * np.count_nonzero(land) - 2 * shared
+
+def trace_contour(land):
+    """
+    Trace the outer contour of a landmass with Moore-neighbour tracing.
+    
+    Starts at the first land cell in row-major order and walks clockwise
+    around the landmass until it re-enters the start cell from the same side
+    (Jacob's stopping criterion). The work is proportional to the contour length.
+    
+    Args:
+        land: 2D boolean array holding a single landmass
+    
+    Returns:
+        A list of (row, col) cells along the outer contour, in clockwise order
+    """
+    land = np.asarray(land, dtype=bool)
+    flat = np.flatnonzero(land)
+    if flat.size == 0:
+        return []
+    
+    # A water border means neighbours never need a bounds check
+    padded = np.pad(land, 1)
+    width = padded.shape[1]
+    start = int(flat[0] // land.shape[1] + 1) * width + int(flat[0] % land.shape[1]) + 1
+    offsets = [di * width + dj for di, dj in MOORE_OFFSETS]
+    direction_of = {offset: index for index, offset in enumerate(offsets)}
+    cells = padded.ravel()
+    
+    # The start cell is the first land cell in row-major order, so its west neighbour is water
+    current, backtrack = start, start + offsets[0]
+    first_step = None
+    contour = []
+    while True:
+        k = direction_of[backtrack - current]
+        for _ in range(8):
+            k = (k + 1) % 8
+            candidate = current + offsets[k]
+            if cells[candidate]:
+                break
+            backtrack = candidate
+        else:
+            contour.append(divmod(current, width))
+            break  # Isolated cell
+        
+        # Back at the start and about to repeat the first step: the contour is closed
+        if current == start:
+            if first_step == candidate:
+                break
+            first_step = first_step or candidate
+        contour.append(divmod(current, width))
+        current = candidate
+    return [(i - 1, j - 1) for i, j in contour]
 
-def compute_island_boundary(island_map):
+def compute_island_boundary(island_map, tile_rows=None):
     """
     Compute the boundary of the largest contiguous landmass.
     
+    Landmasses are 4-connected components found by a single labelling pass.
+    A cell of the largest one is on the boundary if one of its four
+    neighbours is water (or another landmass) or lies outside the map. The
+    perimeter counts cell edges between the landmass and everything else,
+    including the edges of any lakes inside it. With tile_rows set, the
+    boundary test runs in strips of that many rows, each with a one-row halo
+    above and below, so its temporary arrays stay proportional to the strip.
+    
+    This does not bound memory overall: the labelling pass and the perimeter
+    still build arrays the size of the whole map (an int32 label per cell).
+    Maps that do not fit in memory should go through iter_island_boundary or
+    write_island_boundary, which read the map in strips throughout.
+    
     Args:
         island_map: 2D numpy array where 1 represents land and 0 represents water
+        tile_rows: Rows per strip of the boundary test, or None to test the whole map at once
     
     Returns:
         A list of boundary points and the total perimeter length
     """
+    land = largest_landmass(island_map)
+    height = land.shape[0]
+    tile_rows = tile_rows or max(height, 1)
+    
+    boundary_points = []
+    for top in range(0, height, tile_rows):
+        bottom = min(top + tile_rows, height)
+        above = land[top - 1] if top > 0 else None
+        below = land[bottom] if bottom < height else None
+        rows, cols = np.nonzero(boundary_mask(land[top:bottom], above, below))
+        boundary_points.extend(zip((rows + top).tolist(), cols.tolist()))
+    
+    perimeter = edge_perimeter(land)
+    return boundary_points, perimeter
+
+def open_land_mask(path, shape=None, dtype=np.uint8):
+    """
+    Open a land mask on disk without reading it into memory.
+    
+    Args:
+        path: A .npy file, or a raw row-major file of `dtype` values
+        shape: (height, width) of a raw file; ignored for .npy files
+        dtype: Cell type of a raw file
+    
+    Returns:
+        A read-only memory-mapped 2D array where 1 represents land and 0 represents water
+    """
+    if str(path).endswith('.npy'):
+        return np.load(path, mmap_mode='r')
+    if shape is None:
+        raise ValueError("shape is required for raw land mask files")
+    return np.memmap(path, dtype=dtype, mode='r', shape=tuple(shape))
+
+def _label_strip(land, top, bottom):
+    """Label the landmasses of rows top..bottom-1 on their own"""
+    return ndimage.label(np.asarray(land[top:bottom]) == 1, structure=FOUR_CONNECTED)
+
+def _find(parent, label):
+    root = label
+    while parent[root] != root:
+        root = parent[root]
+    while parent[label] != root:
+        parent[label], label = root, parent[label]
+    return root
+
+def label_strips(land, strip_rows=4096):
+    """
+    First streaming pass: label each strip and merge landmasses across strip seams.
+    
+    Strip labels are numbered globally (strip offset + local label, 0 for
+    water). Where land touches across a seam the two labels are merged in a
+    union-find that always keeps the smaller label as the root, so every
+    landmass ends up named by its first cell in row-major order.
+    
+    Args:
+        land: 2D array-like (e.g. memory-mapped) where 1 represents land
+        strip_rows: Rows read at a time
+    
+    Returns:
+        An array mapping every global label to its landmass root, and an array of landmass sizes by root
+    """
+    height = land.shape[0]
+    parent = [0]
+    sizes = [np.zeros(1, dtype=np.int64)]
+    previous_last_row = None
+    for top in range(0, height, strip_rows):
+        bottom = min(top + strip_rows, height)
+        labels, count = _label_strip(land, top, bottom)
+        offset = len(parent) - 1
+        parent.extend(range(offset + 1, offset + count + 1))
+        sizes.append(np.bincount(labels.ravel(), minlength=count + 1)[1:])
+        
+        global_labels = np.where(labels > 0, labels + offset, 0)
+        if previous_last_row is not None:
+            touching = (previous_last_row > 0) & (global_labels[0] > 0)
+            for a, b in set(zip(previous_last_row[touching].tolist(), global_labels[0][touching].tolist())):
+                root_a, root_b = _find(parent, a), _find(parent, b)
+                if root_a != root_b:
+                    parent[max(root_a, root_b)] = min(root_a, root_b)
+        previous_last_row = global_labels[-1]
+    
+    roots = np.array(parent, dtype=np.int64)
+    # Pointer jumping until every label points straight at its root
+    while True:
+        jumped = roots[roots]
+        if np.array_equal(jumped, roots):
+            break
+        roots = jumped
+    root_sizes = np.bincount(roots, weights=np.concatenate(sizes), minlength=len(roots)).astype(np.int64)
+    root_sizes[0] = 0  # Water
+    return roots, root_sizes
+
+def iter_island_boundary(land, strip_rows=4096, stats=None):
+    """
+    Stream the boundary cells of the largest landmass strip by strip.
+    
+    Two passes over the map: label_strips finds the largest landmass, then
+    each strip is labelled again, reduced to that landmass and tested
+    against its neighbours with a one-row halo from the strips above and
+    below. At most three strips are held at once, plus one entry per
+    landmass for the union-find.
+    
+    Args:
+        land: 2D array-like (e.g. from open_land_mask) where 1 represents land
+        strip_rows: Rows read at a time
+        stats: Optional dict, filled with 'area', 'boundary_cells' and 'perimeter' once the generator is exhausted
+    
+    Returns:
+        A generator of (n, 2) int64 arrays of (row, col) boundary cells, in row-major order
+    """
+    height = land.shape[0]
+    roots, root_sizes = label_strips(land, strip_rows)
+    largest = root_sizes.argmax()
+    in_largest = (roots == largest) & (root_sizes[largest] > 0)
+    in_largest[0] = False
+    
+    def largest_strips():
+        offset = 0
+        for top in range(0, height, strip_rows):
+            bottom = min(top + strip_rows, height)
+            labels, count = _label_strip(land, top, bottom)
+            yield top, in_largest[np.where(labels > 0, labels + offset, 0)]
+            offset += count
+    
+    boundary_cells = 0
+    perimeter = 0
+    above = None
+    strips = largest_strips()
+    current = next(strips, None)
+    while current is not None:
+        following = next(strips, None)
+        top, mask = current
+        below = following[1][0] if following is not None else None
+        
+        rows, cols = np.nonzero(boundary_mask(mask, above, below))
+        points = np.stack((rows.astype(np.int64) + top, cols.astype(np.int64)), axis=1)
+        boundary_cells += len(points)
+        
+        # Edges shared with the strip above were counted as perimeter by both strips
+        perimeter += edge_perimeter(mask)
+        if above is not None:
+            perimeter -= 2 * np.count_nonzero(above & mask[0])
+        if len(points):
+            yield points
+        
+        above = mask[-1]
+        current = following
+    
+    if stats is not None:
+        stats.update(area=int(root_sizes[largest]), boundary_cells=boundary_cells, perimeter=int(perimeter))
+
+def write_island_boundary(land, output_path, strip_rows=4096):
+    """
+    Stream the boundary of the largest landmass to a file.
+    
+    Args:
+        land: 2D array-like (e.g. from open_land_mask) where 1 represents land
+        output_path: File that receives the boundary cells as raw int64 (row, col) pairs
+        strip_rows: Rows read at a time
+    
+    Returns:
+        A dict with the landmass area, number of boundary cells and perimeter
+    """
+    stats = {}
+    with open(output_path, 'wb') as f:
+        for points in iter_island_boundary(land, strip_rows, stats):
+            points.tofile(f)
+    return stats
+
+def compute_island_boundary_cp_sat(island_map):
+    """
+    Reference: the boundary test as a CP-SAT model (slow, kept for comparison).
+    
+    Marks boundary cells of every landmass and counts them as the perimeter.
+    
+    Args:
+        island_map: 2D numpy array where 1 represents land and 0 represents water
+    
+    Returns:
+        A list of boundary points and the total perimeter length
+    """
+    from ortools.sat.python import cp_model
+    
     height, width = island_map.shape
     
     # Create the model
@@ -116,8 +431,14 @@ def main():
     
     print(f"Island boundary points: {boundary_points}")
     print(f"Perimeter length: {perimeter}")
+    print(f"Contour: {trace_contour(largest_landmass(island_map))}")
     
     visualize_boundary(island_map, boundary_points)
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) >= 3:
+        # Streaming mode: island-boundary-tracking.py LAND_MASK.npy BOUNDARY.bin [STRIP_ROWS]
+        strip_rows = int(sys.argv[3]) if len(sys.argv) > 3 else 4096
+        print(write_island_boundary(open_land_mask(sys.argv[1]), sys.argv[2], strip_rows))
+    else:
+        main()
@@ -1,4 +1,171 @@
 import math
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import game_search
+
+# Board core: a 0x88 board of integer piece codes. Square index is row * 16 + col
+# (row 0 is black's back rank), and any index with `sq & 0x88` set is off the board.
+WHITE, BLACK = 0, 1
+EMPTY, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = 0, 1, 2, 3, 4, 5, 6
+
+COLOR_NAMES = ('white', 'black')
+COLORS = {'white': WHITE, 'black': BLACK}
+TYPE_NAMES = (None, 'pawn', 'knight', 'bishop', 'rook', 'queen', 'king')
+TYPES = {name: piece_type for piece_type, name in enumerate(TYPE_NAMES) if name}
+
+# Piece values from classical chess theory, King=∞ (represented as 100)
+PIECE_VALUES = (0, 1, 3, 3, 5, 9, 100)
+
+KNIGHT_OFFSETS = (-33, -31, -18, -14, 14, 18, 31, 33)
+BISHOP_DIRECTIONS = (-17, -15, 15, 17)
+ROOK_DIRECTIONS = (-16, 16, -1, 1)
+KING_OFFSETS = (-17, -16, -15, -1, 1, 15, 16, 17)
+SLIDER_DIRECTIONS = {
+    BISHOP: BISHOP_DIRECTIONS,
+    ROOK: ROOK_DIRECTIONS,
+    QUEEN: BISHOP_DIRECTIONS + ROOK_DIRECTIONS,
+}
+PAWN_DIRECTION = (-16, 16)
+PAWN_START_ROW = (6, 1)
+
+def make_piece(color, piece_type):
+    """Integer piece code: colour in bit 3, type in the low three bits"""
+    return (color << 3) | piece_type
+
+def to_square(row, col):
+    return row * 16 + col
+
+def to_position(square):
+    return square >> 4, square & 7
+
+# Bitboard bit for every on-board 0x88 square (bit index row * 8 + col)
+SQUARE_BITS = [0] * 128
+for _sq in range(128):
+    if not _sq & 0x88:
+        SQUARE_BITS[_sq] = 1 << ((_sq >> 4) * 8 + (_sq & 7))
+
+# Precomputed attack tables: knight and king targets, and the squares along each
+# of the eight slider directions (BISHOP_DIRECTIONS + ROOK_DIRECTIONS), nearest first
+ALL_DIRECTIONS = BISHOP_DIRECTIONS + ROOK_DIRECTIONS
+KNIGHT_TARGETS = [()] * 128
+KING_TARGETS = [()] * 128
+RAYS = [()] * 128
+RAY_BITS = [()] * 128  # Bitboard of each ray in RAYS, to skip rays without enemy pieces
+for _sq in range(128):
+    if _sq & 0x88:
+        continue
+    KNIGHT_TARGETS[_sq] = tuple(_sq + o for o in KNIGHT_OFFSETS if not (_sq + o) & 0x88)
+    KING_TARGETS[_sq] = tuple(_sq + o for o in KING_OFFSETS if not (_sq + o) & 0x88)
+    _rays = []
+    for _d in ALL_DIRECTIONS:
+        _ray = []
+        _t = _sq + _d
+        while not _t & 0x88:
+            _ray.append(_t)
+            _t += _d
+        _rays.append(tuple(_ray))
+    RAYS[_sq] = tuple(_rays)
+    RAY_BITS[_sq] = tuple(sum(SQUARE_BITS[_t] for _t in _ray) for _ray in _rays)
+
+def slides_along(piece_type, direction_index):
+    """Whether a piece type attacks along direction ALL_DIRECTIONS[direction_index]"""
+    if direction_index < 4:
+        return piece_type == BISHOP or piece_type == QUEEN
+    return piece_type == ROOK or piece_type == QUEEN
+
+# Zobrist keys: one per (piece code, square), plus side to move
+_zobrist_rng = random.Random(0x5EED)
+ZOBRIST_PIECES = [[_zobrist_rng.getrandbits(64) for _ in range(128)] for _ in range(16)]
+ZOBRIST_SIDE = _zobrist_rng.getrandbits(64)
+
+# Packed move of a transposition table entry without a best move
+NO_MOVE = 0xFFFF
+
+# Scores are packed as 32-bit integers; the extremes stand for -inf and inf
+SCORE_LIMIT = (1 << 31) - 1
+
+class TranspositionTable:
+    """Fixed-size transposition table in preallocated flat arrays.
+
+    Every slot is two 64-bit words. The data word packs the score (bits 0-31),
+    best move (32-47), search depth (48-55), bound type (56-57) and the age of
+    the search that wrote it (58-63); the key word holds `key ^ data`. A slot
+    is replaced when it belongs to an older search or the new entry was
+    searched at least as deep (depth-preferred replacement).
+
+    The arrays can live in an external buffer such as shared memory and be
+    written by several processes without locks. A probe only accepts a slot
+    when its key word XOR its data word gives back the probed key, so a slot
+    whose two words come from different writes is treated as a miss.
+    """
+    ENTRY_BYTES = 8 + 8
+
+    def __init__(self, size=1 << 18, buffer=None):
+        self.size = 1 << max(0, size - 1).bit_length()  # Round up to a power of two
+        self.mask = self.size - 1
+        if buffer is None:
+            buffer = bytearray(self.size * self.ENTRY_BYTES)
+        view = memoryview(buffer)
+        n = self.size
+        self.keys = view[0:8 * n].cast('Q')
+        self.data = view[8 * n:16 * n].cast('Q')
+        self._views = [self.keys, self.data, view]
+        self.age = 1
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def new_search(self):
+        """Age existing entries so they are replaced first"""
+        self.age = self.age % 63 + 1
+
+    def probe(self, key):
+        """Return (depth, bound, score, move) for `key`, or None"""
+        self.probes += 1
+        index = key & self.mask
+        # Read each word once: the check and the fields must come from the same data
+        data = self.data[index]
+        if data == 0 or self.keys[index] ^ data != key:
+            return None
+        self.hits += 1
+        score = (data & 0xFFFFFFFF) - (1 << 31)
+        if score >= SCORE_LIMIT:
+            score = math.inf
+        elif score <= -SCORE_LIMIT:
+            score = -math.inf
+        move = (data >> 32) & 0xFFFF
+        return ((data >> 48) & 0xFF, (data >> 56) & 3, score,
+                None if move == NO_MOVE else (move >> 8, move & 0xFF))
+
+    def store(self, key, depth, bound, score, move):
+        index = key & self.mask
+        old = self.data[index]
+        if old >> 58 == self.age and self.keys[index] ^ old != key and depth < (old >> 48) & 0xFF:
+            return  # Keep the deeper entry from this search
+        score = max(-SCORE_LIMIT, min(SCORE_LIMIT, score))
+        move = NO_MOVE if move is None else (move[0] << 8) | move[1]
+        data = (int(score) + (1 << 31)) | move << 32 | (depth & 0xFF) << 48 | bound << 56 | self.age << 58
+        self.data[index] = data
+        self.keys[index] = key ^ data
+        self.stores += 1
+
+    def release(self):
+        """Release the views on the buffer so shared memory can be closed"""
+        for view in self._views:
+            view.release()
+
+    def stats(self):
+        """Probe and hit counters"""
+        return {
+            'probes': self.probes,
+            'hits': self.hits,
+            'stores': self.stores,
+            'hit_rate': self.hits / self.probes if self.probes else 0.0,
+        }
 
 class Piece:
     def __init__(self, color, piece_type, value):
@@ -6,7 +173,7 @@ class Piece:
         self.type = piece_type  # 'pawn', 'knight', 'bishop', 'rook', 'queen', 'king'
         self.value = value  # Numerical value of piece
         self.has_moved = False
-    
+
     def __str__(self):
         symbols = {
             'white': {'pawn': '♙', 'knight': '♘', 'bishop': '♗', 'rook': '♖', 'queen': '♕', 'king': '♔'},
@@ -14,48 +181,118 @@ class Piece:
         }
         return symbols[self.color][self.type]
 
+    def code(self):
+        """Integer piece code used by the board core"""
+        return make_piece(COLORS[self.color], TYPES[self.type])
+
+class ChessState:
+    """A ChessBoard in the game_search protocol; moves are (from, to) 0x88 square pairs"""
+    def __init__(self, board):
+        self.board = board
+
+    def __getstate__(self):
+        # Only the position, so states can be sent to worker processes without the TT
+        return bytes(self.board.squares), self.board.side
+
+    def __setstate__(self, position):
+        squares, side = position
+        self.board = ChessBoard(tt_size=1 << 10)
+        self.board.load_position(squares, side)
+
+    def moves(self):
+        return self.board.generate_moves(self.board.side)
+
+    def apply(self, move):
+        return self.board.make_square_move(*move)
+
+    def undo(self, move, captured):
+        self.board.undo_square_move(move[0], move[1], captured)
+
+    def hash(self):
+        return self.board.hash
+
+    def evaluate(self):
+        return self.board.material if self.board.side == WHITE else -self.board.material
+
+    def terminal(self):
+        return None in self.board.king_squares
+
+    def order_key(self, move):
+        # Captures by MVV-LVA, ahead of every quiet move
+        squares = self.board.squares
+        victim = squares[move[1]]
+        if victim == EMPTY:
+            return 0
+        return PIECE_VALUES[victim & 7] * 128 - PIECE_VALUES[squares[move[0]] & 7]
+
 class ChessBoard:
-    def __init__(self):
-        self.board = [[None for _ in range(8)] for _ in range(8)]
-        self.current_player = 'white'
+    def __init__(self, tt_size=1 << 18):
+        self.squares = bytearray(128)  # 0x88 mailbox of piece codes
+        self.piece_lists = [set(), set()]  # Occupied 0x88 squares per side
+        self.occupancy = [0, 0]  # Bitboard of occupied squares per side
+        self.material = 0  # White material minus black material
+        self.side = WHITE
+        self.king_squares = [None, None]  # Cached 0x88 king square per side
+        self.moved = 0  # Bitboard of squares whose piece has moved through make_move
+        self.moved_history = []  # `moved` before each make_move, for undo_move
+        self.hash = 0  # Zobrist hash of pieces and side to move
+        # Negamax, move ordering and statistics come from the shared search core
+        self.searcher = game_search.GameSearch(ChessState(self), tt=TranspositionTable(tt_size))
         self.initialize_board()
-        
+
+    @property
+    def current_player(self):
+        return COLOR_NAMES[self.side]
+
+    @current_player.setter
+    def current_player(self, color):
+        if COLORS[color] != self.side:
+            self.side ^= 1
+            self.hash ^= ZOBRIST_SIDE
+
     def initialize_board(self):
         """Set up the initial chess board"""
-        # Piece values from classical chess theory
-        # Pawn=1, Knight=3, Bishop=3, Rook=5, Queen=9, King=∞ (represented as 100)
-        
-        # Set up pawns
+        back_rank = (ROOK, KNIGHT, BISHOP, QUEEN, KING, BISHOP, KNIGHT, ROOK)
         for col in range(8):
-            self.board[1][col] = Piece('black', 'pawn', 1)
-            self.board[6][col] = Piece('white', 'pawn', 1)
-            
-        # Set up rooks
-        self.board[0][0] = Piece('black', 'rook', 5)
-        self.board[0][7] = Piece('black', 'rook', 5)
-        self.board[7][0] = Piece('white', 'rook', 5)
-        self.board[7][7] = Piece('white', 'rook', 5)
-        
-        # Set up knights
-        self.board[0][1] = Piece('black', 'knight', 3)
-        self.board[0][6] = Piece('black', 'knight', 3)
-        self.board[7][1] = Piece('white', 'knight', 3)
-        self.board[7][6] = Piece('white', 'knight', 3)
-        
-        # Set up bishops
-        self.board[0][2] = Piece('black', 'bishop', 3)
-        self.board[0][5] = Piece('black', 'bishop', 3)
-        self.board[7][2] = Piece('white', 'bishop', 3)
-        self.board[7][5] = Piece('white', 'bishop', 3)
-        
-        # Set up queens
-        self.board[0][3] = Piece('black', 'queen', 9)
-        self.board[7][3] = Piece('white', 'queen', 9)
-        
-        # Set up kings
-        self.board[0][4] = Piece('black', 'king', 100)
-        self.board[7][4] = Piece('white', 'king', 100)
-    
+            self.put_piece(0, col, BLACK, back_rank[col])
+            self.put_piece(1, col, BLACK, PAWN)
+            self.put_piece(6, col, WHITE, PAWN)
+            self.put_piece(7, col, WHITE, back_rank[col])
+
+    def clear(self):
+        """Remove every piece from the board"""
+        for square in list(self.piece_lists[WHITE]) + list(self.piece_lists[BLACK]):
+            self.remove_piece(*to_position(square))
+        self.moved_history = []
+
+    def put_piece(self, row, col, color, piece_type):
+        """Place a piece (integer colour and type) on an empty square"""
+        square = to_square(row, col)
+        self.squares[square] = make_piece(color, piece_type)
+        self.hash ^= ZOBRIST_PIECES[self.squares[square]][square]
+        if piece_type == KING:
+            self.king_squares[color] = square
+        self.piece_lists[color].add(square)
+        self.occupancy[color] |= SQUARE_BITS[square]
+        self.moved &= ~SQUARE_BITS[square]
+        self.material += PIECE_VALUES[piece_type] if color == WHITE else -PIECE_VALUES[piece_type]
+
+    def remove_piece(self, row, col):
+        """Remove the piece on a square, if any"""
+        square = to_square(row, col)
+        piece = self.squares[square]
+        if piece == EMPTY:
+            return
+        color, piece_type = piece >> 3, piece & 7
+        self.squares[square] = EMPTY
+        self.hash ^= ZOBRIST_PIECES[piece][square]
+        if self.king_squares[color] == square:
+            self.king_squares[color] = None
+        self.piece_lists[color].discard(square)
+        self.occupancy[color] &= ~SQUARE_BITS[square]
+        self.moved &= ~SQUARE_BITS[square]
+        self.material -= PIECE_VALUES[piece_type] if color == WHITE else -PIECE_VALUES[piece_type]
+
     def print_board(self):
         """Print the current state of the board"""
         print("  a b c d e f g h")
@@ -63,7 +300,7 @@ class ChessBoard:
         for i in range(8):
             print(f"{8-i}|", end=" ")
             for j in range(8):
-                piece = self.board[i][j]
+                piece = self.get_piece_at(i, j)
                 if piece is None:
                     print(".", end=" ")
                 else:
@@ -71,377 +308,451 @@ class ChessBoard:
             print(f"|{8-i}")
         print(" +-----------------+")
         print("  a b c d e f g h")
-        
+
     def is_valid_position(self, row, col):
         """Check if a position is within the board boundaries"""
         return 0 <= row < 8 and 0 <= col < 8
-    
+
     def get_piece_at(self, row, col):
         """Get the piece at a specific position"""
         if self.is_valid_position(row, col):
-            return self.board[row][col]
+            code = self.squares[to_square(row, col)]
+            if code != EMPTY:
+                piece_type = code & 7
+                piece = Piece(COLOR_NAMES[code >> 3], TYPE_NAMES[piece_type], PIECE_VALUES[piece_type])
+                piece.has_moved = bool(self.moved & SQUARE_BITS[to_square(row, col)])
+                return piece
         return None
-    
+
     def get_all_moves(self, color):
         """Get all possible moves for a specific color"""
-        all_moves = []
-        for row in range(8):
-            for col in range(8):
-                piece = self.get_piece_at(row, col)
-                if piece is not None and piece.color == color:
-                    moves = self.get_piece_moves(row, col)
-                    for move in moves:
-                        all_moves.append(((row, col), move))
-        return all_moves
-    
+        return [(to_position(frm), to_position(to)) for frm, to in self.generate_moves(COLORS[color])]
+
     def get_piece_moves(self, row, col):
         """Get all possible moves for a piece at a specific position"""
-        piece = self.get_piece_at(row, col)
-        if piece is None:
+        square = to_square(row, col)
+        if not self.is_valid_position(row, col) or self.squares[square] == EMPTY:
             return []
-            
         moves = []
-        
-        # Pawn moves
-        if piece.type == 'pawn':
-            moves = self.get_pawn_moves(row, col, piece.color)
-            
-        # Knight moves
-        elif piece.type == 'knight':
-            moves = self.get_knight_moves(row, col, piece.color)
-            
-        # Bishop moves
-        elif piece.type == 'bishop':
-            moves = self.get_bishop_moves(row, col, piece.color)
-            
-        # Rook moves
-        elif piece.type == 'rook':
-            moves = self.get_rook_moves(row, col, piece.color)
-            
-        # Queen moves (combination of bishop and rook)
-        elif piece.type == 'queen':
-            moves = self.get_bishop_moves(row, col, piece.color) + self.get_rook_moves(row, col, piece.color)
-            
-        # King moves
-        elif piece.type == 'king':
-            moves = self.get_king_moves(row, col, piece.color)
-            
-        return moves
-        
-    def get_pawn_moves(self, row, col, color):
-        """Get all possible moves for a pawn"""
-        moves = []
-        direction = -1 if color == 'white' else 1
-        start_row = 6 if color == 'white' else 1
-        
-        # Move forward one square
-        new_row = row + direction
-        if self.is_valid_position(new_row, col) and self.get_piece_at(new_row, col) is None:
-            moves.append((new_row, col))
-            
-            # Move forward two squares from starting position
-            if row == start_row:
-                new_row = row + 2 * direction
-                if self.is_valid_position(new_row, col) and self.get_piece_at(new_row, col) is None:
-                    moves.append((new_row, col))
-        
-        # Capture diagonally
-        for col_offset in [-1, 1]:
-            new_col = col + col_offset
-            new_row = row + direction
-            if self.is_valid_position(new_row, new_col):
-                target_piece = self.get_piece_at(new_row, new_col)
-                if target_piece is not None and target_piece.color != color:
-                    moves.append((new_row, new_col))
-        
-        return moves
-        
-    def get_knight_moves(self, row, col, color):
-        """Get all possible moves for a knight"""
-        moves = []
-        offsets = [
-            (-2, -1), (-2, 1), (-1, -2), (-1, 2),
-            (1, -2), (1, 2), (2, -1), (2, 1)
-        ]
-        
-        for row_offset, col_offset in offsets:
-            new_row, new_col = row + row_offset, col + col_offset
-            if self.is_valid_position(new_row, new_col):
-                target_piece = self.get_piece_at(new_row, new_col)
-                if target_piece is None or target_piece.color != color:
-                    moves.append((new_row, new_col))
-        
-        return moves
-        
-    def get_bishop_moves(self, row, col, color):
-        """Get all possible moves for a bishop"""
-        moves = []
-        directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]  # Diagonal directions
-        
-        for row_dir, col_dir in directions:
-            for distance in range(1, 8):
-                new_row, new_col = row + row_dir * distance, col + col_dir * distance
-                if not self.is_valid_position(new_row, new_col):
-                    break
-                    
-                target_piece = self.get_piece_at(new_row, new_col)
-                if target_piece is None:
-                    moves.append((new_row, new_col))
-                elif target_piece.color != color:
-                    moves.append((new_row, new_col))
-                    break
-                else:
-                    break
-        
-        return moves
-        
-    def get_rook_moves(self, row, col, color):
-        """Get all possible moves for a rook"""
-        moves = []
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # Horizontal and vertical directions
-        
-        for row_dir, col_dir in directions:
-            for distance in range(1, 8):
-                new_row, new_col = row + row_dir * distance, col + col_dir * distance
-                if not self.is_valid_position(new_row, new_col):
-                    break
-                    
-                target_piece = self.get_piece_at(new_row, new_col)
-                if target_piece is None:
-                    moves.append((new_row, new_col))
-                elif target_piece.color != color:
-                    moves.append((new_row, new_col))
-                    break
-                else:
-                    break
-        
-        return moves
-        
-    def get_king_moves(self, row, col, color):
-        """Get all possible moves for a king"""
+        self._add_piece_moves(square, moves)
+        return [to_position(to) for _, to in moves]
+
+    def generate_moves(self, color):
+        """Pseudo-legal moves for one side as (from, to) 0x88 square pairs, in board-scan order"""
         moves = []
-        directions = [
-            (-1, -1), (-1, 0), (-1, 1),
-            (0, -1), (0, 1),
-            (1, -1), (1, 0), (1, 1)
-        ]
-        
-        for row_dir, col_dir in directions:
-            new_row, new_col = row + row_dir, col + col_dir
-            if self.is_valid_position(new_row, new_col):
-                target_piece = self.get_piece_at(new_row, new_col)
-                if target_piece is None or target_piece.color != color:
-                    moves.append((new_row, new_col))
-        
+        for square in sorted(self.piece_lists[color]):
+            self._add_piece_moves(square, moves)
         return moves
-    
+
+    def _add_piece_moves(self, square, moves):
+        squares = self.squares
+        piece = squares[square]
+        color, piece_type = piece >> 3, piece & 7
+
+        if piece_type == PAWN:
+            direction = PAWN_DIRECTION[color]
+
+            # Move forward one square, or two from the starting row
+            target = square + direction
+            if not target & 0x88 and squares[target] == EMPTY:
+                moves.append((square, target))
+                target += direction
+                if square >> 4 == PAWN_START_ROW[color] and not target & 0x88 and squares[target] == EMPTY:
+                    moves.append((square, target))
+
+            # Capture diagonally
+            for target in (square + direction - 1, square + direction + 1):
+                if not target & 0x88:
+                    occupant = squares[target]
+                    if occupant != EMPTY and occupant >> 3 != color:
+                        moves.append((square, target))
+
+        elif piece_type == KNIGHT or piece_type == KING:
+            for offset in KNIGHT_OFFSETS if piece_type == KNIGHT else KING_OFFSETS:
+                target = square + offset
+                if not target & 0x88:
+                    occupant = squares[target]
+                    if occupant == EMPTY or occupant >> 3 != color:
+                        moves.append((square, target))
+
+        else:
+            for direction in SLIDER_DIRECTIONS[piece_type]:
+                target = square + direction
+                while not target & 0x88:
+                    occupant = squares[target]
+                    if occupant == EMPTY:
+                        moves.append((square, target))
+                    else:
+                        if occupant >> 3 != color:
+                            moves.append((square, target))
+                        break
+                    target += direction
+
+    def make_square_move(self, frm, to):
+        """Move a piece between 0x88 squares and return the captured piece code"""
+        squares = self.squares
+        piece = squares[frm]
+        captured = squares[to]
+        color = piece >> 3
+
+        squares[to] = piece
+        squares[frm] = EMPTY
+        pieces = self.piece_lists[color]
+        pieces.remove(frm)
+        pieces.add(to)
+        self.occupancy[color] ^= SQUARE_BITS[frm] | SQUARE_BITS[to]
+        self.hash ^= ZOBRIST_PIECES[piece][frm] ^ ZOBRIST_PIECES[piece][to] ^ ZOBRIST_SIDE
+        if piece & 7 == KING:
+            self.king_squares[color] = to
+
+        if captured != EMPTY:
+            self.hash ^= ZOBRIST_PIECES[captured][to]
+            if captured & 7 == KING:
+                self.king_squares[color ^ 1] = None
+            self.piece_lists[color ^ 1].remove(to)
+            self.occupancy[color ^ 1] ^= SQUARE_BITS[to]
+            value = PIECE_VALUES[captured & 7]
+            self.material += value if color == WHITE else -value
+
+        self.side ^= 1
+        return captured
+
+    def undo_square_move(self, frm, to, captured):
+        """Reverse make_square_move"""
+        squares = self.squares
+        piece = squares[to]
+        color = piece >> 3
+
+        squares[frm] = piece
+        squares[to] = captured
+        pieces = self.piece_lists[color]
+        pieces.remove(to)
+        pieces.add(frm)
+        self.occupancy[color] ^= SQUARE_BITS[frm] | SQUARE_BITS[to]
+        self.hash ^= ZOBRIST_PIECES[piece][frm] ^ ZOBRIST_PIECES[piece][to] ^ ZOBRIST_SIDE
+        if piece & 7 == KING:
+            self.king_squares[color] = frm
+
+        if captured != EMPTY:
+            self.hash ^= ZOBRIST_PIECES[captured][to]
+            if captured & 7 == KING:
+                self.king_squares[color ^ 1] = to
+            self.piece_lists[color ^ 1].add(to)
+            self.occupancy[color ^ 1] ^= SQUARE_BITS[to]
+            value = PIECE_VALUES[captured & 7]
+            self.material -= value if color == WHITE else -value
+
+        self.side ^= 1
+
     def make_move(self, from_pos, to_pos):
         """Make a move on the board"""
-        from_row, from_col = from_pos
-        to_row, to_col = to_pos
-        
-        piece = self.get_piece_at(from_row, from_col)
-        if piece is None:
+        frm, to = to_square(*from_pos), to_square(*to_pos)
+        if self.squares[frm] == EMPTY:
             return False
-            
+        self.make_square_move(frm, to)
         # Mark the piece as moved
-        piece.has_moved = True
-        
-        # Make the move
-        self.board[to_row][to_col] = piece
-        self.board[from_row][from_col] = None
-        
-        # Switch current player
-        self.current_player = 'black' if self.current_player == 'white' else 'white'
+        self.moved_history.append(self.moved)
+        self.moved = (self.moved & ~SQUARE_BITS[frm]) | SQUARE_BITS[to]
         return True
-    
+
     def undo_move(self, from_pos, to_pos, captured_piece=None):
         """Undo a move on the board"""
-        from_row, from_col = from_pos
-        to_row, to_col = to_pos
-        
-        piece = self.get_piece_at(to_row, to_col)
-        if piece is None:
+        frm, to = to_square(*from_pos), to_square(*to_pos)
+        if self.squares[to] == EMPTY:
             return False
-            
-        # Undo the move
-        self.board[from_row][from_col] = piece
-        self.board[to_row][to_col] = captured_piece
-        
-        # Switch current player back
-        self.current_player = 'black' if self.current_player == 'white' else 'white'
+        self.undo_square_move(frm, to, captured_piece.code() if captured_piece is not None else EMPTY)
+        if self.moved_history:
+            self.moved = self.moved_history.pop()
         return True
-    
+
+    def find_king(self, color):
+        """0x88 square of the king of the given side, or None"""
+        return self.king_squares[color]
+
+    def is_square_attacked(self, square, by_color, ignore=None):
+        """Check if any piece of `by_color` attacks `square`, looking outward from it.
+
+        `ignore` is treated as empty, so a king can test the squares behind it
+        along a checking ray.
+        """
+        squares = self.squares
+
+        for target in KNIGHT_TARGETS[square]:
+            if squares[target] == make_piece(by_color, KNIGHT):
+                return True
+        for target in KING_TARGETS[square]:
+            if squares[target] == make_piece(by_color, KING):
+                return True
+
+        # A pawn attacks diagonally forward, so look one row back from its point of view
+        pawn_row_square = square - PAWN_DIRECTION[by_color]
+        for target in (pawn_row_square - 1, pawn_row_square + 1):
+            if not target & 0x88 and squares[target] == make_piece(by_color, PAWN):
+                return True
+
+        enemies = self.occupancy[by_color]
+        ray_bits = RAY_BITS[square]
+        for index, ray in enumerate(RAYS[square]):
+            if not ray_bits[index] & enemies:
+                continue  # No attacker can stand on this ray
+            for target in ray:
+                occupant = squares[target]
+                if occupant == EMPTY or target == ignore:
+                    continue
+                if occupant >> 3 == by_color and slides_along(occupant & 7, index):
+                    return True
+                break
+
+        return False
+
     def is_check(self, color):
         """Check if the king of the specified color is in check"""
-        # Find the king
-        king_pos = None
-        for row in range(8):
-            for col in range(8):
-                piece = self.get_piece_at(row, col)
-                if piece is not None and piece.color == color and piece.type == 'king':
-                    king_pos = (row, col)
-                    break
-            if king_pos:
-                break
-                
-        if not king_pos:
+        side = COLORS[color]
+        king_square = self.king_squares[side]
+        if king_square is None:
             return False  # No king found
-            
-        # Check if any opponent's piece can capture the king
-        opponent_color = 'black' if color == 'white' else 'white'
-        for row in range(8):
-            for col in range(8):
-                piece = self.get_piece_at(row, col)
-                if piece is not None and piece.color == opponent_color:
-                    moves = self.get_piece_moves(row, col)
-                    if king_pos in moves:
-                        return True
-                        
-        return False
-    
+        return self.is_square_attacked(king_square, side ^ 1)
+
+    def checks_and_pins(self, color):
+        """Checking pieces and pinned pieces for the king of `color`.
+
+        Returns (checks, pins): checks is a list of square sets that a non-king
+        move must land on to answer each check (the checker plus any squares
+        between it and the king); pins maps a pinned piece's square to the set
+        of squares it may still move to.
+        """
+        squares = self.squares
+        king_square = self.king_squares[color]
+        enemy = color ^ 1
+        checks = []
+        pins = {}
+
+        for target in KNIGHT_TARGETS[king_square]:
+            if squares[target] == make_piece(enemy, KNIGHT):
+                checks.append({target})
+        for target in KING_TARGETS[king_square]:
+            if squares[target] == make_piece(enemy, KING):
+                checks.append({target})
+        pawn_row_square = king_square - PAWN_DIRECTION[enemy]
+        for target in (pawn_row_square - 1, pawn_row_square + 1):
+            if not target & 0x88 and squares[target] == make_piece(enemy, PAWN):
+                checks.append({target})
+
+        enemies = self.occupancy[enemy]
+        ray_bits = RAY_BITS[king_square]
+        for index, ray in enumerate(RAYS[king_square]):
+            if not ray_bits[index] & enemies:
+                continue  # Neither a check nor a pin without an enemy piece on the ray
+            line = set()
+            shield = None  # Own piece standing between king and a possible pinner
+            for target in ray:
+                line.add(target)
+                occupant = squares[target]
+                if occupant == EMPTY:
+                    continue
+                if occupant >> 3 == color:
+                    if shield is not None:
+                        break  # Two own pieces: no pin on this ray
+                    shield = target
+                    continue
+                if slides_along(occupant & 7, index):
+                    if shield is None:
+                        checks.append(set(line))
+                    else:
+                        pins[shield] = set(line)
+                break
+
+        return checks, pins
+
+    def generate_legal_moves(self, color):
+        """Legal moves for one side, filtering checks and pins without making any move"""
+        moves = self.generate_moves(color)
+        king_square = self.king_squares[color]
+        if king_square is None:
+            return moves
+
+        checks, pins = self.checks_and_pins(color)
+        enemy = color ^ 1
+        legal = []
+        for frm, to in moves:
+            if frm == king_square:
+                if not self.is_square_attacked(to, enemy, ignore=king_square):
+                    legal.append((frm, to))
+                continue
+            if len(checks) > 1:
+                continue  # Double check: only the king can move
+            if checks and to not in checks[0]:
+                continue
+            if frm in pins and to not in pins[frm]:
+                continue
+            legal.append((frm, to))
+        return legal
+
+    def get_legal_moves(self, color):
+        """Get all legal moves for a specific color"""
+        return [(to_position(frm), to_position(to)) for frm, to in self.generate_legal_moves(COLORS[color])]
+
     def is_checkmate(self, color):
         """Check if the king of the specified color is in checkmate"""
-        if not self.is_check(color):
-            return False
-            
-        # Check if any move can get the king out of check
-        for from_row in range(8):
-            for from_col in range(8):
-                piece = self.get_piece_at(from_row, from_col)
-                if piece is not None and piece.color == color:
-                    moves = self.get_piece_moves(from_row, from_col)
-                    for to_row, to_col in moves:
-                        # Try the move
-                        captured_piece = self.get_piece_at(to_row, to_col)
-                        self.make_move((from_row, from_col), (to_row, to_col))
-                        
-                        # Check if still in check
-                        still_in_check = self.is_check(color)
-                        
-                        # Undo the move
-                        self.undo_move((from_row, from_col), (to_row, to_col), captured_piece)
-                        
-                        if not still_in_check:
-                            return False  # Found a move that gets out of check
-        
-        return True  # No move can get out of check
-    
+        return self.is_check(color) and not self.generate_legal_moves(COLORS[color])
+
     def is_stalemate(self, color):
         """Check if the king of the specified color is in stalemate"""
-        if self.is_check(color):
-            return False
-            
-        # Check if any move is possible
-        for from_row in range(8):
-            for from_col in range(8):
-                piece = self.get_piece_at(from_row, from_col)
-                if piece is not None and piece.color == color:
-                    moves = self.get_piece_moves(from_row, from_col)
-                    if moves:
-                        return False  # Found a possible move
-        
-        return True  # No move is possible
-    
+        return not self.is_check(color) and not self.generate_legal_moves(COLORS[color])
+
     def evaluate_board(self):
         """Evaluate the current board position"""
-        # Simple evaluation: sum of piece values
-        white_score = 0
-        black_score = 0
-        
-        for row in range(8):
-            for col in range(8):
-                piece = self.get_piece_at(row, col)
-                if piece is not None:
-                    if piece.color == 'white':
-                        white_score += piece.value
-                    else:
-                        black_score += piece.value
-        
-        return white_score - black_score
-    
-    def minimax(self, depth, alpha, beta, maximizing_player):
-        """Minimax algorithm with alpha-beta pruning"""
-        if depth == 0:
-            return self.evaluate_board()
-            
-        if maximizing_player:
-            best_score = -math.inf
-            for from_pos, to_pos in self.get_all_moves('white'):
-                # Make move
-                captured_piece = self.get_piece_at(to_pos[0], to_pos[1])
-                self.make_move(from_pos, to_pos)
-                
-                # Recursive evaluation
-                score = self.minimax(depth - 1, alpha, beta, False)
-                
-                # Undo move
-                self.undo_move(from_pos, to_pos, captured_piece)
-                
-                # Update best score and alpha
-                best_score = max(best_score, score)
-                alpha = max(alpha, best_score)
-                
-                # Alpha-beta pruning
-                if beta <= alpha:
-                    break
-                    
-            return best_score
-            
-        else:  # Minimizing player
-            best_score = math.inf
-            for from_pos, to_pos in self.get_all_moves('black'):
-                # Make move
-                captured_piece = self.get_piece_at(to_pos[0], to_pos[1])
-                self.make_move(from_pos, to_pos)
-                
-                # Recursive evaluation
-                score = self.minimax(depth - 1, alpha, beta, True)
-                
-                # Undo move
-                self.undo_move(from_pos, to_pos, captured_piece)
-                
-                # Update best score and beta
-                best_score = min(best_score, score)
-                beta = min(beta, best_score)
-                
-                # Alpha-beta pruning
-                if beta <= alpha:
-                    break
-                    
-            return best_score
-    
-    def get_best_move(self, color, depth=3):
+        # Simple evaluation: sum of piece values, kept up to date by every move
+        return self.material
+
+    def minimax(self, depth, alpha, beta, maximizing_player, ply=1):
+        """Minimax algorithm with alpha-beta pruning, scored from white's point of view
+
+        A wrapper over the shared game_search negamax (and its transposition
+        table) with white to move when `maximizing_player` and black otherwise.
+        """
+        side = self.side
+        self.current_player = 'white' if maximizing_player else 'black'
+        try:
+            if maximizing_player:
+                return self.searcher.negamax(depth, alpha, beta, ply)
+            return -self.searcher.negamax(depth, -beta, -alpha, ply)
+        finally:
+            self.current_player = COLOR_NAMES[side]
+
+    def get_best_move(self, color, depth=3, time_limit_ms=None):
         """Find the best move for the specified color using minimax with alpha-beta pruning"""
-        best_move = None
-        
-        if color == 'white':
-            best_score = -math.inf
-            for from_pos, to_pos in self.get_all_moves('white'):
-                # Make move
-                captured_piece = self.get_piece_at(to_pos[0], to_pos[1])
-                self.make_move(from_pos, to_pos)
-                
-                # Evaluate
-                score = self.minimax(depth - 1, -math.inf, math.inf, False)
-                
-                # Undo move
-                self.undo_move(from_pos, to_pos, captured_piece)
-                
-                # Update best move
-                if score > best_score:
-                    best_score = score
-                    best_move = (from_pos, to_pos)
-                    
-        else:  # color == 'black'
-            best_score = math.inf
-            for from_pos, to_pos in self.get_all_moves('black'):
-                # Make move
-                captured_piece = self.get_piece_at(to_pos[0], to_pos[1])
-                self.make_move(from_pos, to_pos)
-                
-                # Evaluate
-                score = self.minimax(depth - 1, -math.inf, math.inf, True)
-                
-                # Undo move
-                self.undo_move
\ No newline at end of file
+        return self.search(color, depth, time_limit_ms).move
+
+    def search(self, color, max_depth=3, time_limit_ms=None, shuffle_seed=None):
+        """Iterative deepening for `color` with the shared game_search negamax.
+
+        Returns the game_search SearchResult with moves as ((row, col), (row, col))
+        pairs and the score from white's point of view. The board, including
+        the side to move, is left as it was. `shuffle_seed` shuffles the root
+        moves, which changes the order among equally ranked moves.
+        """
+        side = self.side
+        self.current_player = color
+        try:
+            result = self.searcher.search(max_depth, time_limit_ms, shuffle_seed)
+        finally:
+            self.current_player = COLOR_NAMES[side]
+        pv = [(to_position(frm), to_position(to)) for frm, to in result.pv]
+        return result._replace(move=pv[0] if pv else None,
+                               score=result.score if COLORS[color] == WHITE else -result.score, pv=pv)
+
+    def load_position(self, squares, side):
+        """Replace the position with a 0x88 square array and side to move"""
+        self.clear()
+        for square in range(128):
+            piece = squares[square]
+            if not square & 0x88 and piece != EMPTY:
+                self.put_piece(square >> 4, square & 7, piece >> 3, piece & 7)
+        self.current_player = COLOR_NAMES[side]
+
+    def parallel_search(self, color, workers=4, max_depth=5, time_limit_ms=None):
+        """Lazy SMP: search the same root in several processes sharing one transposition table.
+
+        Worker 0 searches to `max_depth` in the normal move order; helpers go
+        one ply deeper on odd indices and shuffle their root moves, so they
+        fill the shared table with different parts of the tree. When worker 0
+        finishes, the helpers are told to stop, and the deepest completed
+        result is returned.
+        """
+        if workers <= 1:
+            return self.search(color, max_depth, time_limit_ms)
+
+        tt_size = self.searcher.tt.size
+        tt_bytes = tt_size * TranspositionTable.ENTRY_BYTES
+        shm = shared_memory.SharedMemory(create=True, size=tt_bytes + 1)  # Last byte is the stop flag
+        try:
+            shm.buf[:tt_bytes + 1] = bytes(tt_bytes + 1)
+            position = (bytes(self.squares), self.side)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(_lazy_smp_worker, shm.name, tt_size, position, color,
+                                    max_depth + (index % 2), time_limit_ms, index)
+                    for index in range(workers)
+                ]
+                futures[0].result()
+                shm.buf[tt_bytes] = 1
+                results = [future.result() for future in futures]
+        finally:
+            shm.close()
+            shm.unlink()
+
+        return max(results, key=lambda result: result.depth)
+
+    def perft(self, depth, color=None):
+        """Count the leaf nodes of the pseudo-legal move tree to the given depth"""
+        side = self.side if color is None else COLORS[color]
+        if depth == 0:
+            return 1
+
+        nodes = 0
+        for frm, to in self.generate_moves(side):
+            captured = self.make_square_move(frm, to)
+            nodes += self.perft(depth - 1, COLOR_NAMES[side ^ 1]) if depth > 1 else 1
+            self.undo_square_move(frm, to, captured)
+        return nodes
+
+def _lazy_smp_worker(shm_name, tt_size, position, color, max_depth, time_limit_ms, worker_index):
+    """Search one Lazy SMP thread of work inside a pool process"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    tt_bytes = tt_size * TranspositionTable.ENTRY_BYTES
+    board = ChessBoard(tt_size=1)
+    board.load_position(*position)
+    searcher = board.searcher
+    searcher.tt = TranspositionTable(tt_size, shm.buf[:tt_bytes])
+    searcher.stop_flag = shm.buf[tt_bytes:tt_bytes + 1]
+    try:
+        return board.search(color, max_depth, time_limit_ms,
+                            shuffle_seed=worker_index if worker_index else None)
+    finally:
+        searcher.tt.release()
+        searcher.stop_flag.release()
+        shm.close()
+
+def benchmark_lazy_smp(depth=6, worker_counts=(1, 2, 4, 8)):
+    """Print time-to-depth and speedup of parallel_search for several worker counts"""
+    baseline = None
+    for workers in worker_counts:
+        board = ChessBoard()
+        start = time.perf_counter()
+        result = board.parallel_search('white', workers, depth)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers} workers: depth {result.depth} in {elapsed:.2f}s "
+              f"(speedup {baseline / elapsed:.2f}x, move {result.move})")
+
+def benchmark_perft(max_depth=4):
+    """Print perft node counts and moves per second from the initial position"""
+    board = ChessBoard()
+    for depth in range(1, max_depth + 1):
+        start = time.perf_counter()
+        nodes = board.perft(depth)
+        elapsed = time.perf_counter() - start
+        print(f"perft({depth}) = {nodes:>10}  {nodes / elapsed:>12.0f} moves/s")
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark_perft()
+        sys.exit()
+    if "--smp-benchmark" in sys.argv:
+        benchmark_lazy_smp()
+        sys.exit()
+
+    # Let the AI play a few moves against itself, 200 ms per move
+    board = ChessBoard()
+    board.print_board()
+    for _ in range(6):
+        color = board.current_player
+        result = board.search(color, max_depth=64, time_limit_ms=200)
+        from_pos, to_pos = result.move
+        board.make_move(from_pos, to_pos)
+        stats = board.searcher.statistics()
+        print(f"{color} moves {from_pos} -> {to_pos} (depth {result.depth}, {result.nodes} nodes, "
+              f"EBF {stats['effective_branching_factor']:.1f}, "
+              f"first-move cutoffs {stats['first_move_cutoff_rate']:.0%})")
+    board.print_board()
@@ -1,68 +1,160 @@
 import math
+import random
+import sys
+
+import numpy as np
+
+from game_search import GameSearch, SearchTimeout
+
+class CoinIntervalSolver:
+    """Bottom-up interval DP for the coin game, solved once in O(n²).
+
+    best[lo, hi] is the most the player to move can collect from coins[lo..hi]
+    when both players play optimally. Since the two players share the coins in
+    the interval, the opponent's share is the interval sum minus that, which
+    comes from prefix sums. After the precompute any sub-interval's value and
+    optimal move are O(1) lookups.
+    """
+    def __init__(self, coins):
+        self.coins = np.asarray(coins)
+        n = len(self.coins)
+        self.prefix = np.concatenate(([0], np.cumsum(self.coins)))
+        self.best = np.zeros((n + 1, n + 1), dtype=self.prefix.dtype)
+        self.take_left = np.zeros((n + 1, n + 1), dtype=bool)
+
+        if n:
+            idx = np.arange(n)
+            self.best[idx, idx] = self.coins
+            self.take_left[idx, idx] = True
+
+        # Fill one diagonal (interval length) at a time, every interval of that length at once
+        for length in range(2, n + 1):
+            lo = np.arange(n - length + 1)
+            hi = lo + length - 1
+            after_left = self.best[lo + 1, hi]
+            after_right = self.best[lo, hi - 1]
+            total = self.prefix[hi + 1] - self.prefix[lo]
+            # Leave the opponent the smaller best; prefer the left coin on ties
+            self.take_left[lo, hi] = after_left <= after_right
+            self.best[lo, hi] = total - np.minimum(after_left, after_right)
+
+    def interval_sum(self, lo, hi):
+        return (self.prefix[hi + 1] - self.prefix[lo]).item()
+
+    def value(self, lo, hi):
+        """Best total for the player to move on coins[lo..hi] (inclusive)"""
+        if lo > hi:
+            return 0
+        return self.best[lo, hi].item()
+
+    def best_move(self, lo, hi):
+        """Optimal move on coins[lo..hi] and the mover's resulting total"""
+        if lo > hi:
+            raise ValueError("no coins left to pick")
+        return ('left' if self.take_left[lo, hi] else 'right'), self.value(lo, hi)
+
+class CoinGameState:
+    """Coin row in the game_search protocol
+    
+    The remaining coins are coins[lo..hi]. Each move scores the coin it takes
+    (move_score), so a searched value is what the player to move will still
+    collect minus what the opponent will, whatever was taken before. The
+    position is therefore just the window (lo, hi).
+    """
+    def __init__(self, coins, lo=0, hi=None):
+        self.coins = coins
+        self.lo = lo
+        self.hi = len(coins) - 1 if hi is None else hi
+    
+    def moves(self):
+        return ['left', 'right'] if self.lo < self.hi else ['left'] if self.lo == self.hi else []
+    
+    def apply(self, move):
+        if move == 'left':
+            self.lo += 1
+        else:
+            self.hi -= 1
+    
+    def undo(self, move, _=None):
+        if move == 'left':
+            self.lo -= 1
+        else:
+            self.hi += 1
+    
+    def hash(self):
+        return self.lo, self.hi
+    
+    def evaluate(self):
+        # Nothing is known yet about how the coins left in the window will be shared
+        return 0
+    
+    def terminal(self):
+        return self.lo > self.hi
+    
+    def move_score(self, move):
+        return self.coins[self.lo] if move == 'left' else self.coins[self.hi]
+    
+    order_key = move_score
 
 class CoinGame:
     def __init__(self, coins):
         self.coins = coins
         self.max_score = 0
         self.min_score = 0
+        self.solver = CoinIntervalSolver(coins)
+        
+        # Alpha-beta state: searcher (and its transposition table) for one coin row, node counter and limit
+        self.ab_coins = None
+        self.ab_search = None
+        self.nodes = 0
+        self.node_limit = None
         
     def print_game_state(self, coins, max_score, min_score):
         """Print the current state of the game"""
         print(f"Coins: {coins}")
         print(f"Max score: {max_score}, Min score: {min_score}")
         
-    def alpha_beta_minimax(self, coins, depth, alpha, beta, is_maximizing):
-        """Minimax algorithm with alpha-beta pruning"""
-        # Base case: If no coins left
-        if len(coins) == 0:
-            return 0
-            
+    def alpha_beta_minimax(self, coins, lo, hi, alpha, beta, is_maximizing, use_cache=True):
+        """Minimax algorithm with alpha-beta pruning over the window coins[lo..hi]
+        
+        Returns Max's total from the window. The search is the shared game_search
+        negamax over a CoinGameState; its transposition table keeps exact, lower
+        and upper bounds per window for one coin row, so a value cut short by
+        pruning is never reused as if it were exact.
+        """
+        if self.ab_coins != tuple(coins):
+            self.ab_coins = tuple(coins)
+            self.ab_search = GameSearch(CoinGameState(list(coins)))
+        search = self.ab_search
+        search.use_tt = use_cache
+        search.nodes = self.nodes
+        search.node_limit = self.node_limit
+        state = search.state
+        state.lo, state.hi = lo, hi
+        
+        # negamax scores the mover's coins minus the opponent's: 2 * mover's total - window total
+        total = sum(coins[lo:hi + 1])
         if is_maximizing:
-            best_score = -math.inf
-            
-            # Try taking the leftmost coin
-            value = coins[0]
-            score = value + self.alpha_beta_minimax(coins[1:], depth + 1, alpha, beta, False)
-            best_score = max(best_score, score)
-            alpha = max(alpha, best_score)
-            
-            # Try taking the rightmost coin
-            if len(coins) > 1 and alpha < beta:  # Skip if already pruned
-                value = coins[-1]
-                score = value + self.alpha_beta_minimax(coins[:-1], depth + 1, alpha, beta, False)
-                best_score = max(best_score, score)
-                alpha = max(alpha, best_score)
-                
-            # Alpha-beta pruning
-            if beta <= alpha:
-                return best_score
-                
-            return best_score
-            
-        else:  # Minimizing player
-            best_score = math.inf
-            
-            # Try taking the leftmost coin
-            score = self.alpha_beta_minimax(coins[1:], depth + 1, alpha, beta, True)
-            best_score = min(best_score, score)
-            beta = min(beta, best_score)
-            
-            # Try taking the rightmost coin
-            if len(coins) > 1 and alpha < beta:  # Skip if already pruned
-                score = self.alpha_beta_minimax(coins[:-1], depth + 1, alpha, beta, True)
-                best_score = min(best_score, score)
-                beta = min(beta, best_score)
-                
-            # Alpha-beta pruning
-            if beta <= alpha:
-                return best_score
-                
-            return best_score
+            low, high = 2 * alpha - total, 2 * beta - total
+        else:
+            low, high = total - 2 * beta, total - 2 * alpha
+        try:
+            diff = search.negamax(hi - lo + 1, low, high)
+        finally:
+            self.nodes = search.nodes
+        return (total + diff) // 2 if is_maximizing else (total - diff) // 2
     
     def get_best_move(self, coins):
-        """Determine the best move for Max player using alpha-beta pruning"""
-        take_left_score = coins[0] + self.alpha_beta_minimax(coins[1:], 0, -math.inf, math.inf, False)
-        take_right_score = coins[-1] + self.alpha_beta_minimax(coins[:-1], 0, -math.inf, math.inf, False)
+        """Determine the best move for Max player using the interval DP"""
+        if list(coins) != list(self.solver.coins):
+            self.solver = CoinIntervalSolver(coins)
+        return self.solver.best_move(0, len(coins) - 1)
+
+    def get_best_move_alpha_beta(self, coins, use_cache=True):
+        """Reference: determine the best move for Max player using alpha-beta pruning"""
+        n = len(coins)
+        take_left_score = coins[0] + self.alpha_beta_minimax(coins, 1, n - 1, -math.inf, math.inf, False, use_cache)
+        take_right_score = coins[-1] + self.alpha_beta_minimax(coins, 0, n - 2, -math.inf, math.inf, False, use_cache)
         
         if take_left_score >= take_right_score:
             return 'left', take_left_score
@@ -80,41 +172,30 @@ class CoinGame:
         """Play the coin game"""
         print(f"Initial Coins: {self.coins}")
         
-        current_coins = self.coins.copy()
+        # The remaining coins are always self.coins[lo..hi], so Max's move is a table lookup
+        lo, hi = 0, len(self.coins) - 1
         current_player = 'Max'  # Max goes first
         
-        while current_coins:
+        while lo <= hi:
             if current_player == 'Max':
                 # Max's turn
-                move, _ = self.get_best_move(current_coins)
-                
-                if move == 'left':
-                    coin_value = current_coins[0]
-                    print(f"Max picks {coin_value}, Remaining Coins: {current_coins[1:]}")
-                    self.max_score += coin_value
-                    current_coins = current_coins[1:]
-                else:  # move == 'right'
-                    coin_value = current_coins[-1]
-                    print(f"Max picks {coin_value}, Remaining Coins: {current_coins[:-1]}")
-                    self.max_score += coin_value
-                    current_coins = current_coins[:-1]
-                    
-                current_player = 'Min'
-                
+                move, _ = self.solver.best_move(lo, hi)
             else:  # Min's turn
-                move = self.min_player_move(current_coins)
-                
-                if move == 'left':
-                    coin_value = current_coins[0]
-                    print(f"Min picks {coin_value}, Remaining Coins: {current_coins[1:]}")
-                    self.min_score += coin_value
-                    current_coins = current_coins[1:]
-                else:  # move == 'right'
-                    coin_value = current_coins[-1]
-                    print(f"Min picks {coin_value}, Remaining Coins: {current_coins[:-1]}")
-                    self.min_score += coin_value
-                    current_coins = current_coins[:-1]
-                    
+                move = self.min_player_move(self.coins[lo:hi + 1])
+            
+            if move == 'left':
+                coin_value = self.coins[lo]
+                lo += 1
+            else:  # move == 'right'
+                coin_value = self.coins[hi]
+                hi -= 1
+            print(f"{current_player} picks {coin_value}, Remaining Coins: {self.coins[lo:hi + 1]}")
+            
+            if current_player == 'Max':
+                self.max_score += coin_value
+                current_player = 'Min'
+            else:
+                self.min_score += coin_value
                 current_player = 'Max'
         
         # Game over
@@ -126,7 +207,49 @@ class CoinGame:
         else:
             print("It's a tie!")
 
+def compare_search_nodes(sizes=(30, 40, 50, 60), node_limit=2000000, seed=0):
+    """Print alpha-beta nodes visited before and after the bound-aware transposition table
+    
+    "Before" is the same alpha-beta search with the table switched off. It
+    grows exponentially with the row length, so it is only run where the
+    growth rate measured on rows of 10-24 coins predicts it finishes within
+    `node_limit` nodes; other sizes show that prediction, marked with '~'.
+    """
+    rng = random.Random(seed)
+    
+    def count_nodes(coins, use_cache):
+        game = CoinGame(coins)
+        game.node_limit = node_limit
+        try:
+            game.get_best_move_alpha_beta(coins, use_cache)
+        except SearchTimeout:
+            return None
+        return game.nodes
+    
+    # Least-squares fit of log(nodes) against row length for the search without the table
+    points = []
+    for size in range(10, 26, 2):
+        nodes = count_nodes([rng.randint(1, 50) for _ in range(size)], False)
+        if nodes is not None:
+            points.append((size, math.log(nodes)))
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / sum((x - mean_x) ** 2 for x, _ in points)
+    print(f"Without the table, nodes grow about {math.exp(slope):.2f}x per extra coin")
+    
+    for size in sizes:
+        coins = [rng.randint(1, 50) for _ in range(size)]
+        predicted = math.exp(mean_y + slope * (size - mean_x))
+        before = count_nodes(coins, False) if predicted <= node_limit else None
+        after = count_nodes(coins, True)
+        before_text = f"~{predicted:.2g}" if before is None else str(before)
+        print(f"{size} coins: nodes before (no table) {before_text:>10}, after (with table) {after:>6}")
+
 if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        compare_search_nodes()
+        sys.exit()
+    
     # Sample coins as given in the example
     coins = [3, 9, 1, 2, 7, 5]
     game = CoinGame(coins)
@@ -0,0 +1,342 @@
+"""Game-independent search core shared by the lab 7 games.
+
+A game plugs in by exposing a small protocol on a mutable state object:
+
+    moves()        -> list of legal moves for the player to move (hashable values)
+    apply(move)    -> make the move in place and return whatever undo needs
+    undo(move, u)  -> take the move back, given apply's return value
+    hash()         -> hashable key of the position, including the player to move
+    evaluate()     -> score from the point of view of the player to move
+    terminal()     -> True when the game is over
+
+and optionally
+
+    order_key(move)  -> static ordering score, higher is searched first
+                        (e.g. MVV-LVA for captures)
+    move_score(move) -> points the move itself earns the player making it;
+                        searched scores then count only what is still to come,
+                        so hash() need not include a running total
+    canonical_move(move) -> the move in the orientation of hash(), when hash()
+                            maps symmetric positions to one key
+    actual_move(move)    -> a move stored under hash() mapped back onto the
+                            current position
+
+GameSearch runs negamax with alpha-beta pruning, a transposition table and
+iterative deepening over any such state, orders moves by TT move, the game's
+order_key, killer moves and history, and counts nodes, TT hits and cutoffs
+so every game can be measured the same way. The table defaults to a
+dictionary; a game can pass any object with the same probe/store/new_search/
+stats methods instead, such as chess's fixed-size array table.
+"""
+import importlib
+import math
+import random
+import sys
+import time
+from collections import namedtuple
+
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+MAX_PLY = 128
+
+SearchResult = namedtuple('SearchResult', 'move score depth nodes pv elapsed_ms')
+
+class SearchTimeout(Exception):
+    """Raised inside the search when its time or node budget runs out, or it is told to stop"""
+
+class TranspositionTable:
+    """Dictionary transposition table, cleared when it reaches `max_entries`"""
+    def __init__(self, max_entries=1 << 20):
+        self.entries = {}
+        self.max_entries = max_entries
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def new_search(self):
+        """Entries stay valid from one search to the next"""
+
+    def probe(self, key):
+        """Return (depth, bound, score, move) for `key`, or None"""
+        self.probes += 1
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+        return entry
+
+    def store(self, key, depth, bound, score, move):
+        if len(self.entries) >= self.max_entries:
+            self.entries.clear()
+        self.entries[key] = (depth, bound, score, move)
+        self.stores += 1
+
+    def stats(self):
+        """Probe and hit counters"""
+        return {
+            'probes': self.probes,
+            'hits': self.hits,
+            'stores': self.stores,
+            'hit_rate': self.hits / self.probes if self.probes else 0.0,
+        }
+
+class GameSearch:
+    def __init__(self, state, max_tt_entries=1 << 20, use_tt=True, tt=None):
+        self.state = state
+        self.use_tt = use_tt
+        self.tt = TranspositionTable(max_tt_entries) if tt is None else tt
+        self.order_key = getattr(state, 'order_key', None)
+        self.move_score = getattr(state, 'move_score', None)
+        self.canonical_move = getattr(state, 'canonical_move', None)
+        self.actual_move = getattr(state, 'actual_move', None)
+        self.deadline = None  # perf_counter() time at which the search aborts
+        self.stop_flag = None  # Buffer whose first byte another process sets to stop the search
+        self.node_limit = None  # Node count at which the search aborts (checked every 1024 nodes)
+        self.shuffle_seed = None
+
+        # Move ordering state: two killer moves per ply and a history score per move
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = {}
+        self.reset_statistics()
+
+    def reset_statistics(self):
+        """Zero the node, TT and cutoff counters"""
+        self.nodes = 0
+        self.tt_hits = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.iteration_nodes = []
+        self.elapsed_ms = 0.0
+
+    def order_moves(self, moves, ply, tt_move=None):
+        """Sort moves in place: TT move, game order_key, killers, then history"""
+        killer0, killer1 = self.killers[ply] if ply < MAX_PLY else (None, None)
+        history_get = self.history.get
+        order_key = self.order_key
+
+        def priority(move):
+            if move == tt_move:
+                return math.inf, 0, 0
+            return (order_key(move) if order_key is not None else 0,
+                    2 if move == killer0 else 1 if move == killer1 else 0,
+                    history_get(move, 0))
+
+        moves.sort(key=priority, reverse=True)
+        return moves
+
+    def record_cutoff(self, move, depth, ply, move_index):
+        """Update killers, history and cutoff counters after a beta cutoff"""
+        self.cutoffs += 1
+        if move_index == 0:
+            self.first_move_cutoffs += 1
+        if self.order_key is not None and self.order_key(move) > 0:
+            return  # Already ranked by the game, e.g. captures by MVV-LVA
+        self.history[move] = self.history.get(move, 0) + depth * depth
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+
+    def _should_stop(self):
+        if self.stop_flag is not None and self.stop_flag[0]:
+            return True
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            return True
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+    def negamax(self, depth, alpha, beta, ply=0):
+        """Alpha-beta negamax; scores are from the point of view of the player to move"""
+        self.nodes += 1
+        if not self.nodes & 1023 and self._should_stop():
+            raise SearchTimeout()
+
+        state = self.state
+        if depth == 0 or state.terminal():
+            return state.evaluate()
+
+        alpha_orig = alpha
+        tt_move = None
+        key = None
+        if self.use_tt:
+            key = state.hash()
+            entry = self.tt.probe(key)
+            if entry is not None:
+                tt_depth, bound, tt_score, tt_move = entry
+                if tt_move is not None and self.actual_move is not None:
+                    tt_move = self.actual_move(tt_move)
+                if tt_depth >= depth:
+                    self.tt_hits += 1
+                    if bound == EXACT:
+                        return tt_score
+                    if bound == LOWER_BOUND:
+                        alpha = max(alpha, tt_score)
+                    else:
+                        beta = min(beta, tt_score)
+                    if alpha >= beta:
+                        return tt_score
+
+        moves = self.order_moves(state.moves(), ply, tt_move)
+        if not moves:
+            return state.evaluate()
+
+        move_score = self.move_score
+        best_score, best_move = -math.inf, None
+        for index, move in enumerate(moves):
+            gain = move_score(move) if move_score is not None else 0
+            undo = state.apply(move)
+            try:
+                score = gain - self.negamax(depth - 1, gain - beta, gain - alpha, ply + 1)
+            finally:
+                # Also runs when a timeout unwinds the search, so the state stays intact
+                state.undo(move, undo)
+            if score > best_score:
+                best_score, best_move = score, move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                self.record_cutoff(move, depth, ply, index)
+                break
+
+        if self.use_tt:
+            if best_score <= alpha_orig:
+                bound = UPPER_BOUND
+            elif best_score >= beta:
+                bound = LOWER_BOUND
+            else:
+                bound = EXACT
+            if best_move is not None and self.canonical_move is not None:
+                best_move = self.canonical_move(best_move)
+            self.tt.store(key, depth, bound, best_score, best_move)
+        return best_score
+
+    def _search_root(self, depth, first_move):
+        """Search every root move to `depth`, `first_move` first; returns the best move and its score"""
+        state = self.state
+        moves = state.moves()
+        if self.shuffle_seed is not None:
+            # Changes the order among moves that order_moves ranks equally
+            random.Random(self.shuffle_seed).shuffle(moves)
+        self.order_moves(moves, 0)
+        if first_move in moves:
+            moves.remove(first_move)
+            moves.insert(0, first_move)
+
+        move_score = self.move_score
+        alpha, best_move = -math.inf, None
+        for move in moves:
+            gain = move_score(move) if move_score is not None else 0
+            undo = state.apply(move)
+            try:
+                score = gain - self.negamax(depth - 1, -math.inf, gain - alpha, 1)
+            finally:
+                state.undo(move, undo)
+            if best_move is None or score > alpha:
+                alpha, best_move = score, move
+        return best_move, alpha
+
+    def principal_variation(self, depth):
+        """Follow TT moves from the current position, up to `depth` plies"""
+        state = self.state
+        pv, undos = [], []
+        try:
+            for _ in range(depth):
+                entry = self.tt.probe(state.hash()) if self.use_tt and not state.terminal() else None
+                if entry is None or entry[3] is None:
+                    break
+                move = entry[3] if self.actual_move is None else self.actual_move(entry[3])
+                if move not in state.moves():
+                    break
+                undos.append((move, state.apply(move)))
+                pv.append(move)
+        finally:
+            for move, undo in reversed(undos):
+                state.undo(move, undo)
+        return pv
+
+    def search(self, max_depth=4, time_limit_ms=None, shuffle_seed=None, stop_score=None):
+        """Iterative deepening up to `max_depth`, optionally under a time budget in milliseconds
+
+        Depth 1 always completes, so a move is returned even with a tiny
+        budget; a deeper iteration cut short by the clock or the stop flag is
+        discarded. Deepening also ends once the score reaches `stop_score` in
+        either direction, i.e. a forced result has been found. `shuffle_seed`
+        shuffles the root moves, which changes the order among equally
+        ranked moves. Without a move the score is state.evaluate().
+        """
+        self.reset_statistics()
+        start = time.perf_counter()
+        self.tt.new_search()
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = {move: score >> 1 for move, score in self.history.items()}  # Let old history fade
+        self.shuffle_seed = shuffle_seed
+        best_move, best_score, reached = None, self.state.evaluate(), 0
+
+        if not self.state.terminal():
+            for depth in range(1, max_depth + 1):
+                if time_limit_ms is not None and depth > 1:
+                    self.deadline = start + time_limit_ms / 1000
+                nodes_before = self.nodes
+                try:
+                    move, score = self._search_root(depth, best_move)
+                except SearchTimeout:
+                    break
+                finally:
+                    self.deadline = None
+                if move is None:
+                    break
+                best_move, best_score, reached = move, score, depth
+                self.iteration_nodes.append(self.nodes - nodes_before)
+                if stop_score is not None and abs(score) >= stop_score:
+                    break
+
+        pv = []
+        if best_move is not None:
+            undo = self.state.apply(best_move)
+            try:
+                pv = [best_move] + self.principal_variation(reached - 1)
+            finally:
+                self.state.undo(best_move, undo)
+        self.elapsed_ms = (time.perf_counter() - start) * 1000
+        return SearchResult(best_move, best_score, reached, self.nodes, pv, self.elapsed_ms)
+
+    def statistics(self):
+        """Node, TT and cutoff counters of the last search"""
+        nodes = self.iteration_nodes
+        seconds = self.elapsed_ms / 1000
+        return {
+            'nodes': self.nodes,
+            'nodes_per_second': self.nodes / seconds if seconds > 0 else 0.0,
+            'tt_hits': self.tt_hits,
+            'cutoffs': self.cutoffs,
+            'first_move_cutoff_rate': self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0,
+            'iteration_nodes': list(nodes),
+            'effective_branching_factor': (nodes[-1] / nodes[-2]) if len(nodes) > 1 and nodes[-2] else 0.0,
+            'elapsed_ms': self.elapsed_ms,
+        }
+
+def benchmark_games(chess_depth=4, coin_count=16, seed=0):
+    """Search one position of each lab 7 game with and without the TT and print the counters"""
+    # The games live in scripts whose file names are not valid identifiers
+    coin_module = importlib.import_module('coin-picking-alpha-beta')
+    tic_tac_toe_module = importlib.import_module('tic-tac-toe-minimax')
+    chess_module = importlib.import_module('chess-ai')
+
+    rng = random.Random(seed)
+    coins = [rng.randint(1, 50) for _ in range(coin_count)]
+    cases = [
+        ('coins', lambda: coin_module.CoinGameState(coins), coin_count),
+        ('tic-tac-toe', lambda: tic_tac_toe_module.TicTacToeState(tic_tac_toe_module.TicTacToe()), 9),
+        ('chess', lambda: chess_module.ChessState(chess_module.ChessBoard()), chess_depth),
+    ]
+
+    for name, make_state, depth in cases:
+        for use_tt in (False, True):
+            searcher = GameSearch(make_state(), use_tt=use_tt)
+            result = searcher.search(depth)
+            stats = searcher.statistics()
+            print(f"{name:<12} tt={'on ' if use_tt else 'off'} depth {result.depth:>2}: {result.nodes:>8} nodes "
+                  f"in {result.elapsed_ms:>8.1f} ms ({stats['nodes_per_second']:>9.0f} nodes/s), "
+                  f"first-move cutoffs {stats['first_move_cutoff_rate']:.0%}, "
+                  f"move {result.move}, score {result.score}")
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark_games()
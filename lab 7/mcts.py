@@ -0,0 +1,293 @@
+"""Monte Carlo tree search (UCT) over game_search protocol states.
+
+The tree lives in flat arrays indexed by node number rather than in node
+objects: visit counts, value sums, parent, first child and child count, plus
+the move that leads to each node. A node's children are allocated together
+when it is expanded, so they occupy the contiguous range
+first_child[node] .. first_child[node] + child_count[node] - 1.
+
+Value sums are stored from the point of view of the player who made the move
+into the node, with a win worth 1, a draw 0.5 and a loss 0. Rollouts play
+random moves to the end of the game, or for at most `rollout_plies` moves,
+after which the sign of state.evaluate() decides the result.
+
+With workers > 1, each batch selects several leaves. Virtual loss is added
+along every selected path, so later selections in the same batch spread over
+different parts of the tree. The leaves' positions are pickled and their
+rollouts run in a process pool, after which the results are backed up and
+the virtual losses removed. Any state that pickles can be searched in
+parallel this way.
+"""
+import math
+import pickle
+import random
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+def rollout(state, rollout_plies=200, rng=random):
+    """Random playout from `state`, scored for the player to move there: 1 win, 0.5 draw, 0 loss"""
+    played = []
+    try:
+        while len(played) < rollout_plies and not state.terminal():
+            moves = state.moves()
+            if not moves:
+                break
+            move = rng.choice(moves)
+            played.append((move, state.apply(move)))
+        score = state.evaluate()
+    finally:
+        for move, undo in reversed(played):
+            state.undo(move, undo)
+
+    result = 1.0 if score > 0 else 0.0 if score < 0 else 0.5
+    # evaluate() speaks for the player to move at the end of the playout
+    return result if len(played) % 2 == 0 else 1.0 - result
+
+def _rollout_chunk(states, rollout_plies, seed):
+    """Run in a pool worker: one rollout from each pickled leaf state"""
+    rng = random.Random(seed)
+    return [rollout(state, rollout_plies, rng) for state in states]
+
+class MCTS:
+    def __init__(self, state, exploration=1.4, rollout_plies=200, workers=1, batch_size=None,
+                 virtual_loss=1, seed=None):
+        self.state = state
+        self.exploration = exploration
+        self.rollout_plies = rollout_plies
+        self.workers = workers
+        self.batch_size = batch_size or 8 * workers
+        self.virtual_loss = virtual_loss
+        self.rng = random.Random(seed)
+        self.executor = ProcessPoolExecutor(workers) if workers > 1 else None
+        self.playouts = 0
+        self.reset()
+
+    def reset(self):
+        """Discard the tree and start again from a single root node"""
+        self.visits = array('l')
+        self.value_sums = array('d')
+        self.parent = array('l')
+        self.first_child = array('l')
+        self.child_count = array('l')  # -1 until the node is expanded
+        self.move = []
+        self._add_node(-1, None)
+
+    def _add_node(self, parent, move):
+        self.visits.append(0)
+        self.value_sums.append(0.0)
+        self.parent.append(parent)
+        self.first_child.append(0)
+        self.child_count.append(-1)
+        self.move.append(move)
+        return len(self.move) - 1
+
+    def node_count(self):
+        return len(self.move)
+
+    def _select_child(self, node):
+        """UCT: child maximising mean value plus the exploration bonus; unvisited children first"""
+        visits, value_sums = self.visits, self.value_sums
+        first = self.first_child[node]
+        log_parent = math.log(max(visits[node], 1))
+        best, best_score = first, -math.inf
+        for child in range(first, first + self.child_count[node]):
+            n = visits[child]
+            if n == 0:
+                return child
+            score = value_sums[child] / n + self.exploration * math.sqrt(log_parent / n)
+            if score > best_score:
+                best, best_score = child, score
+        return best
+
+    def _select_leaf(self):
+        """Walk down from the root, applying moves to the state; returns the leaf and the moves played"""
+        state = self.state
+        node = 0
+        path = [0]
+        played = []
+        while self.child_count[node] > 0:
+            node = self._select_child(node)
+            move = self.move[node]
+            played.append((move, state.apply(move)))
+            path.append(node)
+
+        # Expand a leaf that has been visited before, then step into its first child
+        if self.child_count[node] < 0 and (self.visits[node] > 0 or node == 0) and not state.terminal():
+            moves = state.moves()
+            self.first_child[node] = len(self.move)
+            self.child_count[node] = len(moves)
+            for move in moves:
+                self._add_node(node, move)
+            if moves:
+                node = self.first_child[node]
+                move = self.move[node]
+                played.append((move, state.apply(move)))
+                path.append(node)
+        return path, played
+
+    def _apply_virtual_loss(self, path, sign):
+        for node in path:
+            self.visits[node] += sign * self.virtual_loss
+
+    def _backup(self, path, result):
+        """Back up a rollout result scored for the player to move at the leaf"""
+        value = 1.0 - result  # For the player who moved into the leaf
+        for node in reversed(path):
+            self.visits[node] += 1
+            self.value_sums[node] += value
+            value = 1.0 - value
+        self.playouts += 1
+
+    def _run_batch(self):
+        state = self.state
+        selections = []
+        for _ in range(self.batch_size):
+            path, played = self._select_leaf()
+            # The leaf position travels to a worker as a pickled copy
+            leaf = pickle_copy(state)
+            for move, undo in reversed(played):
+                state.undo(move, undo)
+            self._apply_virtual_loss(path, 1)
+            selections.append((path, leaf))
+
+        chunks = [selections[i::self.workers] for i in range(self.workers) if selections[i::self.workers]]
+        futures = [self.executor.submit(_rollout_chunk, [leaf for _, leaf in chunk], self.rollout_plies,
+                                        self.rng.getrandbits(32))
+                   for chunk in chunks]
+        for chunk, future in zip(chunks, futures):
+            for (path, _), result in zip(chunk, future.result()):
+                self._apply_virtual_loss(path, -1)
+                self._backup(path, result)
+
+    def _run_one(self):
+        state = self.state
+        path, played = self._select_leaf()
+        try:
+            result = rollout(state, self.rollout_plies, self.rng)
+        finally:
+            for move, undo in reversed(played):
+                state.undo(move, undo)
+        self._backup(path, result)
+
+    def search(self, playouts=None, time_limit_ms=None):
+        """Run playouts until either budget is spent (1000 playouts if neither is given) and return the best move"""
+        if playouts is None and time_limit_ms is None:
+            playouts = 1000
+        deadline = None if time_limit_ms is None else time.perf_counter() + time_limit_ms / 1000
+        done = 0
+        while (playouts is None or done < playouts) and (deadline is None or time.perf_counter() < deadline):
+            before = self.playouts
+            if self.executor is not None:
+                self._run_batch()
+            else:
+                self._run_one()
+            done += self.playouts - before
+        return self.best_move()
+
+    def root_children(self):
+        """(move, visits, mean value) for every child of the root"""
+        first = self.first_child[0]
+        children = []
+        for child in range(first, first + max(self.child_count[0], 0)):
+            n = self.visits[child]
+            children.append((self.move[child], n, self.value_sums[child] / n if n else 0.0))
+        return children
+
+    def best_move(self):
+        """Most visited move at the root, or None if the root has not been expanded"""
+        children = self.root_children()
+        if not children:
+            return None
+        return max(children, key=lambda child: child[1])[0]
+
+    def advance(self, move):
+        """Play `move` on the state and keep the matching subtree as the new root"""
+        new_root = None
+        first = self.first_child[0]
+        for child in range(first, first + max(self.child_count[0], 0)):
+            if self.move[child] == move:
+                new_root = child
+                break
+        self.state.apply(move)
+        if new_root is None or self.child_count[new_root] < 0 and self.visits[new_root] == 0:
+            self.reset()
+            return
+
+        # Copy the subtree into fresh arrays breadth first, keeping each family of children contiguous
+        old = (self.visits, self.value_sums, self.first_child, self.child_count, self.move)
+        self.reset()
+        self.visits[0] = old[0][new_root]
+        self.value_sums[0] = old[1][new_root]
+        queue = [(new_root, 0)]
+        for old_node, new_node in queue:
+            count = old[3][old_node]
+            self.child_count[new_node] = count
+            if count <= 0:
+                continue
+            self.first_child[new_node] = len(self.move)
+            for old_child in range(old[2][old_node], old[2][old_node] + count):
+                new_child = self._add_node(new_node, old[4][old_child])
+                self.visits[new_child] = old[0][old_child]
+                self.value_sums[new_child] = old[1][old_child]
+                queue.append((old_child, new_child))
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def pickle_copy(state):
+    """Independent copy of a state through pickle, as a pool worker would receive it"""
+    return pickle.loads(pickle.dumps(state, pickle.HIGHEST_PROTOCOL))
+
+def play_game(state, playouts=1000, time_limit_ms=None, reuse_tree=True, workers=1, seed=None, verbose=True):
+    """Let MCTS play both sides from `state` and return the moves played
+
+    With `reuse_tree` the subtree under each move played is kept as the
+    next root, so its statistics carry over instead of being searched again.
+    """
+    moves = []
+    with MCTS(state, workers=workers, seed=seed) as engine:
+        while not state.terminal():
+            before = engine.visits[0]
+            start = time.perf_counter()
+            move = engine.search(playouts, time_limit_ms)
+            if move is None:
+                break
+            if verbose:
+                elapsed = time.perf_counter() - start
+                print(f"plays {move}: {engine.visits[0]} root visits ({before} reused), "
+                      f"{engine.node_count()} nodes, {elapsed * 1000:.0f} ms")
+            moves.append(move)
+            if reuse_tree:
+                engine.advance(move)
+            else:
+                state.apply(move)
+                engine.reset()
+    return moves
+
+if __name__ == "__main__":
+    import importlib
+
+    # The games live in scripts whose file names are not valid identifiers
+    tic_tac_toe = importlib.import_module('tic-tac-toe-minimax')
+    if "--chess" in sys.argv:
+        chess_ai = importlib.import_module('chess-ai')
+        state = chess_ai.ChessState(chess_ai.ChessBoard())
+        play_game(state, time_limit_ms=2000, workers=4 if "--parallel" in sys.argv else 1)
+    else:
+        # e.g. python mcts.py 7 7 5 --parallel
+        args = [int(arg) for arg in sys.argv[1:] if arg.isdigit()]
+        rows, cols, k = (args + [3, 3, 3][len(args):])[:3]
+        game = tic_tac_toe.MNKGame(rows, cols, k)
+        play_game(game, playouts=2000, workers=4 if "--parallel" in sys.argv else 1)
+        game.print_board()
+        print("Draw" if game.winner is None else f"{'XO'[game.winner]} wins")
@@ -1,4 +1,138 @@
 import math
+import os
+import sys
+from array import array
+
+from game_search import GameSearch
+
+# Perfect-play table. A board is encoded in base 3 with cell row * 3 + col worth
+# 3 ** (row * 3 + col) times 0 (empty), 1 (AI) or 2 (human). Entry
+# `code + side * NUM_CODES` holds the minimax score for that board with `side`
+# to move (0 = human, 1 = AI): 10 minus the plies to an AI win, its negation
+# for a human win, 0 for a draw. Boards that cannot arise in play hold UNREACHED.
+EMPTY_CELL, AI_CELL, HUMAN_CELL = 0, 1, 2
+NUM_CODES = 3 ** 9
+POWERS = [3 ** i for i in range(9)]
+UNREACHED = -128
+LINES = ((0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6))
+TABLE_MAGIC = b'TTT1'
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tic-tac-toe-table.bin')
+
+def solve_table():
+    """Solve every position reachable from the empty board, with either player starting"""
+    values = array('b', [UNREACHED]) * (2 * NUM_CODES)
+    cells = [EMPTY_CELL] * 9
+    
+    def solve(code, side, filled):
+        key = code + side * NUM_CODES
+        if values[key] != UNREACHED:
+            return values[key]
+        
+        winner = EMPTY_CELL
+        for a, b, c in LINES:
+            if cells[a] != EMPTY_CELL and cells[a] == cells[b] == cells[c]:
+                winner = cells[a]
+                break
+        
+        if winner == AI_CELL:
+            value = 10
+        elif winner == HUMAN_CELL:
+            value = -10
+        elif filled == 9:
+            value = 0
+        else:
+            mover = AI_CELL if side else HUMAN_CELL
+            value = None
+            for i in range(9):
+                if cells[i] == EMPTY_CELL:
+                    cells[i] = mover
+                    child = solve(code + mover * POWERS[i], 1 - side, filled + 1)
+                    cells[i] = EMPTY_CELL
+                    # One ply further away: wins shrink and losses grow towards 0, as with depth in minimax
+                    child = child - 1 if child > 0 else child + 1 if child < 0 else 0
+                    if value is None or (side and child > value) or (not side and child < value):
+                        value = child
+        
+        values[key] = value
+        return value
+    
+    solve(0, 0, 0)
+    solve(0, 1, 0)
+    return values
+
+def load_table(path=TABLE_PATH):
+    """Load the perfect-play table, solving and saving it first if the file is missing or invalid"""
+    values = array('b')
+    try:
+        with open(path, 'rb') as f:
+            if f.read(len(TABLE_MAGIC)) == TABLE_MAGIC:
+                values.fromfile(f, 2 * NUM_CODES)
+    except (OSError, EOFError):
+        values = array('b')
+    
+    if len(values) != 2 * NUM_CODES:
+        values = solve_table()
+        try:
+            with open(path, 'wb') as f:
+                f.write(TABLE_MAGIC)
+                values.tofile(f)
+        except OSError:
+            pass  # Read-only location, keep the table in memory only
+    return values
+
+_table = None
+
+def get_table():
+    """The perfect-play table, loaded once per process"""
+    global _table
+    if _table is None:
+        _table = load_table()
+    return _table
+
+class TicTacToeState:
+    """A TicTacToe board in the game_search protocol, searched in place on game.board"""
+    def __init__(self, game, player=None):
+        self.game = game
+        self.board = game.board
+        self.player = player or game.ai_player
+        self.filled = 9 - len(game.get_available_moves())
+        self.code = game.encode_board()
+    
+    def moves(self):
+        return [(row, col) for row in range(3) for col in range(3) if self.board[row][col] == ' ']
+    
+    def apply(self, move):
+        row, col = move
+        player = self.player
+        self.board[row][col] = player
+        self.code += (AI_CELL if player == self.game.ai_player else HUMAN_CELL) * POWERS[row * 3 + col]
+        self.filled += 1
+        self.player = self.game.human_player if player == self.game.ai_player else self.game.ai_player
+        return player
+    
+    def undo(self, move, player):
+        row, col = move
+        self.board[row][col] = ' '
+        self.code -= (AI_CELL if player == self.game.ai_player else HUMAN_CELL) * POWERS[row * 3 + col]
+        self.filled -= 1
+        self.player = player
+    
+    def hash(self):
+        return self.code, self.player
+    
+    def evaluate(self):
+        # Only the player who just moved can have won; faster wins score higher, as in minimax
+        if self.game.check_winner() is not None:
+            return self.filled - 10
+        return 0
+    
+    def terminal(self):
+        return self.filled == 9 or self.game.check_winner() is not None
+    
+    def order_key(self, move):
+        # Centre, then corners, then edges: the cells on the most lines first
+        row, col = move
+        return 2 if move == (1, 1) else 1 if row != 1 and col != 1 else 0
 
 class TicTacToe:
     def __init__(self):
@@ -7,6 +141,7 @@ class TicTacToe:
         self.current_player = 'O'  # Human player starts
         self.ai_player = 'X'
         self.human_player = 'O'
+        self.table = get_table()
         
     def print_board(self):
         """Print the current state of the board"""
@@ -71,55 +206,54 @@ class TicTacToe:
         return moves
     
     def minimax(self, depth, is_maximizing):
-        """Minimax algorithm implementation"""
-        # Terminal states
-        winner = self.check_winner()
-        if winner == self.ai_player:
-            return 10 - depth
-        elif winner == self.human_player:
-            return depth - 10
-        elif self.is_board_full():
-            return 0
-        
-        # Maximizing player (AI)
-        if is_maximizing:
-            best_score = -math.inf
-            for move in self.get_available_moves():
-                row, col = move
-                self.board[row][col] = self.ai_player
-                score = self.minimax(depth + 1, False)
-                self.board[row][col] = ' '  # Undo move
-                best_score = max(score, best_score)
-            return best_score
+        """Minimax algorithm implementation
         
-        # Minimizing player (Human)
-        else:
-            best_score = math.inf
-            for move in self.get_available_moves():
-                row, col = move
-                self.board[row][col] = self.human_player
-                score = self.minimax(depth + 1, True)
-                self.board[row][col] = ' '  # Undo move
-                best_score = min(score, best_score)
-            return best_score
+        Returns the AI's score with the AI to move if `is_maximizing`, `depth`
+        plies below the position the caller started from: a win in p more
+        plies scores 10 - depth - p, a loss the negation, a draw 0. The
+        search is the shared game_search negamax.
+        """
+        state = TicTacToeState(self, self.ai_player if is_maximizing else self.human_player)
+        score = GameSearch(state).negamax(9, -math.inf, math.inf)
+        if not is_maximizing:
+            score = -score
+        # The state scores a win by stones on the board (10 - stones); minimax counts plies from `depth`
+        shift = state.filled - depth
+        return score + shift if score > 0 else score - shift if score < 0 else 0
+    
+    def encode_board(self):
+        """Base-3 code of the board for the perfect-play table"""
+        code = 0
+        for i in range(3):
+            for j in range(3):
+                cell = self.board[i][j]
+                if cell == self.ai_player:
+                    code += AI_CELL * POWERS[i * 3 + j]
+                elif cell == self.human_player:
+                    code += HUMAN_CELL * POWERS[i * 3 + j]
+        return code
     
     def best_move(self):
-        """Find the best move for AI using minimax"""
+        """Find the best move for AI with one table lookup per empty cell"""
+        code = self.encode_board()
         best_score = -math.inf
         best_move = None
         
-        for move in self.get_available_moves():
-            row, col = move
-            self.board[row][col] = self.ai_player
-            score = self.minimax(0, False)
-            self.board[row][col] = ' '  # Undo move
-            
+        for row, col in self.get_available_moves():
+            # After the AI moves it is the human's turn (side 0)
+            score = self.table[code + AI_CELL * POWERS[row * 3 + col]]
+            if score == UNREACHED:
+                return self.best_move_search()
             if score > best_score:
                 best_score = score
-                best_move = move
-                
+                best_move = (row, col)
+        
         return best_move
     
+    def best_move_search(self):
+        """Find the best move for AI with the shared game_search negamax"""
+        return GameSearch(TicTacToeState(self, self.ai_player)).search(max_depth=9).move
+    
     def play_game(self):
         """Main game loop"""
         print("Welcome to Tic-Tac-Toe!")
@@ -160,6 +294,215 @@ class TicTacToe:
         else:
             print("It's a draw!")
 
+class MNKGame:
+    """Generalized m,n,k game (k in a row on a rows x cols board) with a bitboard engine.
+    
+    Each player's stones are one integer bitmask (bit row * cols + col). Wins
+    are found by testing only the precomputed k-in-a-row masks through the
+    cell just played. The game implements the game_search protocol and is
+    searched by GameSearch; hash() is the smallest encoding of the position
+    over all board symmetries (8 on square boards, 4 otherwise), so mirrored
+    and rotated positions share one transposition table entry. Best moves are
+    stored in the canonical orientation and mapped back on probe.
+    """
+    WIN = 1000000
+    _geometry_cache = {}  # Line masks and symmetry tables per (rows, cols, k)
+    
+    def __init__(self, rows=3, cols=3, k=3, max_tt_entries=2000000):
+        self.rows, self.cols, self.k = rows, cols, k
+        self.cells = rows * cols
+        self.full_mask = (1 << self.cells) - 1
+        self.masks = [0, 0]  # Stones of the first and second player
+        self.side = 0  # Player to move
+        self.stones = 0
+        self.winner = None
+        self.nodes = 0  # Nodes visited by the last best_move search
+        
+        geometry = self._geometry_cache.get((rows, cols, k))
+        if geometry is None:
+            self._build_lines()
+            self._build_symmetries()
+            # Try central cells first: they lie on the most lines
+            self.cell_order = sorted(range(self.cells), key=lambda cell: -len(self.lines_through[cell]))
+            geometry = self._geometry_cache[rows, cols, k] = (
+                self.lines, self.lines_through, self.permutations, self.inverse_permutations,
+                self.byte_tables, self.cell_order)
+        (self.lines, self.lines_through, self.permutations, self.inverse_permutations,
+         self.byte_tables, self.cell_order) = geometry
+        # Symmetry found by the last hash() at each stone count; a search is back on the
+        # hashed position when it stores its move, and deeper positions have more stones
+        self.hash_symmetry = [0] * (self.cells + 1)
+        self.searcher = GameSearch(self, max_tt_entries)
+    
+    def __getstate__(self):
+        # Only the position: the geometry is rebuilt (or found in the cache) on unpickling
+        return self.rows, self.cols, self.k, self.masks, self.side, self.stones, self.winner
+    
+    def __setstate__(self, position):
+        rows, cols, k, masks, side, stones, winner = position
+        self.__init__(rows, cols, k)
+        self.masks, self.side, self.stones, self.winner = list(masks), side, stones, winner
+    
+    def _build_lines(self):
+        rows, cols, k = self.rows, self.cols, self.k
+        self.lines = []
+        for r in range(rows):
+            for c in range(cols):
+                for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_r, end_c = r + dr * (k - 1), c + dc * (k - 1)
+                    if 0 <= end_r < rows and 0 <= end_c < cols:
+                        mask = 0
+                        for step in range(k):
+                            mask |= 1 << ((r + dr * step) * cols + c + dc * step)
+                        self.lines.append(mask)
+        self.lines_through = [[line for line in self.lines if line >> cell & 1] for cell in range(self.cells)]
+    
+    def _build_symmetries(self):
+        rows, cols = self.rows, self.cols
+        if rows == cols:
+            n = rows - 1
+            maps = [lambda r, c: (r, c), lambda r, c: (c, n - r), lambda r, c: (n - r, n - c),
+                    lambda r, c: (n - c, r), lambda r, c: (r, n - c), lambda r, c: (n - r, c),
+                    lambda r, c: (c, r), lambda r, c: (n - c, n - r)]
+        else:
+            maps = [lambda r, c: (r, c), lambda r, c: (r, cols - 1 - c),
+                    lambda r, c: (rows - 1 - r, c), lambda r, c: (rows - 1 - r, cols - 1 - c)]
+        
+        self.permutations = []
+        for mapping in maps:
+            perm = []
+            for cell in range(self.cells):
+                r, c = mapping(*divmod(cell, cols))
+                perm.append(r * cols + c)
+            self.permutations.append(perm)
+        self.inverse_permutations = [[perm.index(cell) for cell in range(self.cells)] for perm in self.permutations]
+        
+        # Per symmetry, per byte of the mask: lookup of the transformed bits
+        self.byte_tables = []
+        for perm in self.permutations:
+            tables = []
+            for chunk in range(0, self.cells, 8):
+                table = [0] * 256
+                for byte in range(256):
+                    out = 0
+                    for bit in range(8):
+                        if byte >> bit & 1 and chunk + bit < self.cells:
+                            out |= 1 << perm[chunk + bit]
+                    table[byte] = out
+                tables.append(table)
+            self.byte_tables.append(tables)
+    
+    def _transform(self, mask, tables):
+        out = 0
+        for table in tables:
+            out |= table[mask & 0xFF]
+            mask >>= 8
+        return out
+    
+    def canonical_key(self):
+        """Smallest symmetric encoding of (stones, side to move) and the symmetry that produced it"""
+        best_key, best_symmetry = None, 0
+        for symmetry, tables in enumerate(self.byte_tables):
+            key = (self._transform(self.masks[0], tables) << self.cells) | self._transform(self.masks[1], tables)
+            if best_key is None or key < best_key:
+                best_key, best_symmetry = key, symmetry
+        return (best_key << 1) | self.side, best_symmetry
+    
+    def moves(self):
+        """Empty cells, most central first"""
+        occupied = self.masks[0] | self.masks[1]
+        return [cell for cell in self.cell_order if not occupied >> cell & 1]
+    
+    def play(self, cell):
+        """Place a stone for the player to move"""
+        mask = self.masks[self.side] | (1 << cell)
+        self.masks[self.side] = mask
+        for line in self.lines_through[cell]:
+            if mask & line == line:
+                self.winner = self.side
+                break
+        self.side ^= 1
+        self.stones += 1
+    
+    def apply(self, cell):
+        """game_search protocol: play `cell`; nothing is needed to undo it"""
+        self.play(cell)
+    
+    def undo(self, cell, _=None):
+        """Take back the stone on `cell`, which must be the last one played"""
+        self.side ^= 1
+        self.masks[self.side] &= ~(1 << cell)
+        self.stones -= 1
+        self.winner = None  # Play stops at the first win, so earlier positions had none
+    
+    def game_over(self):
+        return self.winner is not None or self.stones == self.cells
+    
+    terminal = game_over
+    
+    def hash(self):
+        key, self.hash_symmetry[self.stones] = self.canonical_key()
+        return key
+    
+    def canonical_move(self, cell):
+        """Cell in the orientation of the canonical key, as stored in the transposition table"""
+        return self.permutations[self.hash_symmetry[self.stones]][cell]
+    
+    def actual_move(self, cell):
+        """Stored canonical cell mapped back onto the current board"""
+        return self.inverse_permutations[self.hash_symmetry[self.stones]][cell]
+    
+    def evaluate(self):
+        """Heuristic score for the player to move: open lines weighted by stones in them"""
+        if self.winner is not None:
+            return -(self.WIN - self.stones)  # The previous player just won
+        mine, theirs = self.masks[self.side], self.masks[self.side ^ 1]
+        score = 0
+        for line in self.lines:
+            if not line & theirs:
+                score += (1 << (3 * (line & mine).bit_count())) - 1
+            elif not line & mine:
+                score -= (1 << (3 * (line & theirs).bit_count())) - 1
+        return score
+    
+    def best_move(self, max_depth=None, time_limit_ms=None):
+        """Iterative-deepening search; returns ((row, col), score, depth reached)
+        
+        A finished game has no move: the result is (None, score, 0).
+        """
+        empty = self.cells - self.stones
+        max_depth = empty if max_depth is None else min(max_depth, empty)
+        # Deepening stops early at a forced result, which a deeper search cannot change
+        result = self.searcher.search(max_depth, time_limit_ms, stop_score=self.WIN - self.cells)
+        self.nodes = result.nodes
+        if result.move is None:
+            return None, result.score, 0
+        return divmod(result.move, self.cols), result.score, result.depth
+    
+    def print_board(self):
+        for r in range(self.rows):
+            row = []
+            for c in range(self.cols):
+                bit = 1 << (r * self.cols + c)
+                row.append('X' if self.masks[0] & bit else 'O' if self.masks[1] & bit else '.')
+            print(' '.join(row))
+
+def play_mnk_self_game(rows, cols, k, time_limit_ms=1000):
+    """Let the m,n,k engine play both sides and print the game"""
+    game = MNKGame(rows, cols, k)
+    while not game.game_over():
+        move, score, depth = game.best_move(time_limit_ms=time_limit_ms)
+        game.play(move[0] * cols + move[1])
+        print(f"{'XO'[game.side ^ 1]} plays {move} (score {score}, depth {depth}, {game.nodes} nodes)")
+    game.print_board()
+    print("Draw" if game.winner is None else f"{'XO'[game.winner]} wins")
+
 if __name__ == "__main__":
+    if "--mnk" in sys.argv:
+        # e.g. --mnk 5 5 4
+        rows, cols, k = map(int, sys.argv[sys.argv.index("--mnk") + 1:][:3])
+        play_mnk_self_game(rows, cols, k)
+        sys.exit()
+    
     game = TicTacToe()
     game.play_game()